@@ -0,0 +1,56 @@
+# bench_frame_bridge.py
+#
+# Misst die Kosten der Umwandlung Polars -> pandas -> Polars für einen synthetischen Vertragsframe,
+# einmal NumPy-basiert (bisher) und einmal Arrow-basiert (services/frame_bridge.py).
+# Aufruf aus dem Repository-Wurzelverzeichnis:
+#   PYTHONPATH=app python -m benchmarks.bench_frame_bridge --rows 100000 --repeat 20
+
+import argparse
+import time
+import polars as pl
+
+def synthetic_contracts(rows: int) -> pl.DataFrame:
+    """
+    Erzeugt einen Frame mit den Spalten und Typen der Vertragstabelle.
+    """
+    return pl.DataFrame({
+        "conference": pl.Series(["00", "01"] * (rows // 2) + ["00"] * (rows % 2)),
+        "franchise_name": pl.Series([f"Team {i % 16}" for i in range(rows)]),
+        "player_id": pl.arange(0, rows, eager=True).cast(pl.Int32),
+        "player_name": pl.Series([f"Player {i}" for i in range(rows)]),
+        "pos": pl.Series(["QB", "RB", "WR", "TE"] * (rows // 4) + ["QB"] * (rows % 4)),
+        "salary": pl.arange(0, rows, eager=True).cast(pl.Float64) / 10,
+        "contract_years": (pl.arange(0, rows, eager=True) % 5).cast(pl.Int32),
+    })
+
+def time_roundtrip(df: pl.DataFrame, use_arrow: bool, repeat: int) -> dict:
+    to_pandas, from_pandas = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pdf = df.to_pandas(use_pyarrow_extension_array=use_arrow)
+        to_pandas.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        pl.from_pandas(pdf)
+        from_pandas.append(time.perf_counter() - start)
+    return {
+        "to_pandas_ms": min(to_pandas) * 1000,
+        "from_pandas_ms": min(from_pandas) * 1000,
+        "pandas_mb": pdf.memory_usage(deep=True).sum() / 1024 ** 2,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Umwandlung zwischen Polars und pandas")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    df = synthetic_contracts(args.rows)
+    for name, use_arrow in [("numpy", False), ("arrow", True)]:
+        result = time_roundtrip(df, use_arrow, args.repeat)
+        print(
+            f"{name:<6} rows={args.rows:>8} to_pandas={result['to_pandas_ms']:.2f}ms "
+            f"from_pandas={result['from_pandas_ms']:.2f}ms pandas={result['pandas_mb']:.1f}MB"
+        )
+
+if __name__ == "__main__":
+    main()
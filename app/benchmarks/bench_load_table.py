@@ -0,0 +1,72 @@
+# bench_load_table.py
+#
+# Vergleicht den zeilenweisen Lesepfad (fetchall) mit dem spaltenweisen COPY-Lesepfad.
+# Aufruf aus dem Repository-Wurzelverzeichnis:
+#   PYTHONPATH=app python -m benchmarks.bench_load_table --tables roster contracts --repeat 3
+
+import argparse
+import gc
+import time
+import psutil
+from services.connection_pool import get_connection, pool_stats
+from services.database_service import load_table_from_db
+
+def run_benchmark(table: str, method: str, repeat: int) -> dict:
+    """
+    Lädt `table` `repeat`-mal mit der angegebenen Methode und misst Laufzeit und Speicher.
+
+    Returns:
+    dict: Ergebnis mit bester/mittlerer Laufzeit, RSS-Zuwachs und Größe des DataFrames.
+    """
+    process = psutil.Process()
+    timings = []
+    rss_growth = 0
+    df = None
+    with get_connection() as conn:
+        for _ in range(repeat):
+            df = None
+            gc.collect()
+            rss_before = process.memory_info().rss
+            start = time.perf_counter()
+            df = load_table_from_db(table, conn, method=method)
+            timings.append(time.perf_counter() - start)
+            rss_growth = max(rss_growth, process.memory_info().rss - rss_before)
+
+    return {
+        "table": table,
+        "method": method,
+        "rows": df.height,
+        "best_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "rss_growth_mb": rss_growth / 1024 ** 2,
+        "frame_mb": df.estimated_size("mb"),
+        "schema": {name: str(dtype) for name, dtype in df.schema.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Lesepfade von load_table_from_db")
+    parser.add_argument("--tables", nargs="+", default=["roster", "contracts"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for table in args.tables:
+        results = [run_benchmark(table, method, args.repeat) for method in ("fetch", "copy")]
+        for result in results:
+            print(
+                f"{result['table']:<14} {result['method']:<6} rows={result['rows']:>8} "
+                f"best={result['best_s']:.3f}s mean={result['mean_s']:.3f}s "
+                f"rss+={result['rss_growth_mb']:.1f}MB frame={result['frame_mb']:.1f}MB"
+            )
+        fetch, copy = results
+        print(f"{table:<14} speedup copy vs fetch: {fetch['best_s'] / copy['best_s']:.2f}x")
+        changed = {
+            name: (fetch["schema"].get(name), dtype)
+            for name, dtype in copy["schema"].items()
+            if fetch["schema"].get(name) != dtype
+        }
+        for name, (old, new) in changed.items():
+            print(f"{table:<14} dtype {name}: {old} -> {new}")
+    print(f"pool: {pool_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# bench_pipeline.py
+#
+# Benchmark der Daten- und EPV-Pipeline auf einer synthetischen Liga (siehe synthetic_league.py).
+# Ziele:
+#   cache:    die synthetischen Tabellen werden direkt in den Snapshot-Cache gelegt (ohne Datenbank)
+#   postgres: die Tabellen werden per COPY in eine lokale PostgreSQL-Datenbank geschrieben
+#             (DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASSWORD auf die lokale Instanz setzen!)
+#             Ohne explizit gesetzten DB_HOST bricht der Benchmark ab; ein nicht lokaler Host muss
+#             mit --throwaway-db als Wegwerf-Instanz bestätigt werden.
+# Die synthetische Liga wird unter BENCHMARK_LEAGUE_ID abgelegt und berührt keine echte Liga.
+# Aufruf aus dem Repository-Wurzelverzeichnis:
+#   PYTHONPATH=app python -m benchmarks.bench_pipeline --target cache --players 3000 --seasons 5
+#   PYTHONPATH=app python -m benchmarks.bench_pipeline --target cache --update-baseline
+# Der Exit-Code ist 1, wenn ein Benchmark fehlschlägt oder die gespeicherte Baseline um mehr als --tolerance
+# und zusätzlich --min-delta Sekunden überschreitet (die absolute Schwelle fängt das Rauschen kurzer Messungen ab).
+
+import os
+
+# Gecachte Snapshots dürfen während des Benchmarks nicht ablaufen
+os.environ.setdefault("CACHE_TTL_SECONDS", "86400")
+
+import argparse
+import gc
+import json
+import resource
+import sys
+import time
+import polars as pl
+import psutil
+from benchmarks.synthetic_league import generate_league
+from services.background_jobs import create_job, finish_job
+from services.bulk_writer import write_frame
+from services.connection_pool import get_connection
+from services.data_processing import filter_table, get_unique_teams
+from services.epv_calculations import calculate_new_salary, compute_epvs
+from services.ingestion import build_contracts
+from services.schema import ensure_schema, refresh_views
+from services.snapshot_cache import get_snapshot, invalidate
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+# Liga-ID der synthetischen Daten; echte MFL-Ligen sind fünfstellig
+BENCHMARK_LEAGUE_ID = 999999
+LOCAL_DB_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+def check_database(throwaway: bool) -> None:
+    """
+    Bricht ab, wenn die Datenbank nicht ausdrücklich als lokale oder Wegwerf-Instanz gesetzt ist.
+    Ohne DB_HOST würde config.db_config auf die Produktionsdatenbank zeigen.
+    """
+    host = os.environ.get("DB_HOST")
+    if not host:
+        sys.exit("--target postgres requires DB_HOST to be set explicitly to a local or throwaway instance")
+    if host not in LOCAL_DB_HOSTS and not host.startswith("/") and not throwaway:
+        sys.exit(f"DB_HOST={host} is not local; pass --throwaway-db if this instance may be overwritten")
+
+def seed(target: str, league: dict) -> None:
+    """
+    Stellt die synthetischen Tabellen unter BENCHMARK_LEAGUE_ID für die Lesefunktionen bereit.
+    """
+    invalidate()
+    tables = {
+        table: league[table].with_columns(league_id=pl.lit(BENCHMARK_LEAGUE_ID, pl.Int32))
+        for table in ("franchises", "roster", "contracts")
+    }
+    if target == "postgres":
+        ensure_schema()
+        with get_connection() as conn:
+            for table, df in tables.items():
+                write_frame(conn, table, df, season=df.get_column("season").unique().to_list(), league_id=BENCHMARK_LEAGUE_ID)
+        # mv_teams, mv_seasons und mv_salary_ranks auf die synthetischen Daten bringen
+        refresh_views()
+        return
+    for table, df in tables.items():
+        get_snapshot(table, lambda df=df: df)
+    # Materialisierte Sichten (siehe services/schema.py) aus den synthetischen Verträgen nachbilden
+    contracts = tables["contracts"]
+    get_snapshot("mv_teams", lambda: (
+        contracts.group_by(["league_id", pl.col("franchise_name").fill_null("Free Agent")])
+        .agg(logo=pl.col("logo").min(), division=pl.col("division").min())
+    ))
+    get_snapshot("mv_seasons", lambda: contracts.select(["league_id", "season"]).unique())
+    roster = tables["roster"]
+    get_snapshot("mv_salary_ranks", lambda: (
+        roster.filter(pl.col("salary").is_not_null())
+        .with_columns(rank=pl.col("salary").rank("ordinal", descending=True).over(["league_id", "season", "pos"]))
+        .select(["league_id", "season", "pos", "rank", "salary"])
+    ))
+    # Ohne vorberechnete EPVs wird live gerechnet
+    # Typen wie in der Tabelle epv; ext_yrs muss ganzzahlig sein, sonst scheitert der Join in compute_epvs
+    epv_schema = {
+        "league_id": pl.Int32, "player_id": pl.Int32, "season": pl.Int32, "player_name": pl.Utf8, "pos": pl.Utf8,
+        "salary": pl.Float64, "prev_yrs": pl.Int64, "ext_yrs": pl.Int64, "YO5": pl.Int32, "new_sal": pl.Float64,
+    }
+    get_snapshot("epv", lambda: pl.DataFrame(schema=epv_schema))
+
+def measure(name: str, function, rows: int, repeat: int) -> dict:
+    """
+    Führt `function` `repeat`-mal aus und misst Laufzeit, Durchsatz und Speicher.
+    Fehler werden im Ergebnis vermerkt statt den Lauf abzubrechen.
+    """
+    process = psutil.Process()
+    timings = []
+    rss_growth = 0
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            rss_before = process.memory_info().rss
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+            rss_growth = max(rss_growth, process.memory_info().rss - rss_before)
+    except Exception as e:
+        return {"name": name, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "name": name,
+        "rows": rows,
+        "best_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "rows_per_s": rows / min(timings) if min(timings) > 0 else float("inf"),
+        "rss_growth_mb": rss_growth / 1024 ** 2,
+        # ru_maxrss ist unter Linux in KiB angegeben
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+def run_suite(target: str, league: dict, repeat: int) -> list:
+    contracts = league["contracts"]
+    season = int(contracts.get_column("season").max())
+    team = contracts.filter(pl.col("season") == season).get_column("franchise_name").drop_nulls()[0]
+
+    def epvs():
+        extensions = (
+            filter_table(team, season, BENCHMARK_LEAGUE_ID)
+            .select(["player_id", "conference", "salary", pl.lit(3, pl.Int64).alias("ext_yrs")])
+        )
+        job_id = create_job("benchmark")
+        try:
+            compute_epvs(job_id, extensions, season, BENCHMARK_LEAGUE_ID)
+        finally:
+            finish_job(job_id)
+
+    salary_frame = (
+        contracts.select(["salary", "contract_years"])
+        .with_columns(
+            eys=pl.col("salary") * 1.2,
+            prev_yrs=pl.col("contract_years").fill_null(1),
+            ext_yrs=pl.lit(3),
+        )
+    )
+
+    return [
+        measure("filter_table", lambda: filter_table(team, season, BENCHMARK_LEAGUE_ID), contracts.height, repeat),
+        measure("get_unique_teams", lambda: get_unique_teams(BENCHMARK_LEAGUE_ID), contracts.height, repeat),
+        measure("calculate_epvs", epvs, contracts.height, repeat),
+        measure("calculate_new_salary", lambda: calculate_new_salary(salary_frame), salary_frame.height, repeat),
+        measure(
+            "build_contracts",
+            lambda: build_contracts(league["playerscores"], league["roster"], league["franchises"], league["floor_ranks"]),
+            league["playerscores"].height,
+            repeat,
+        ),
+    ]
+
+def errors(results: list) -> list:
+    return [f"{result['name']} failed: {result['error']}" for result in results if "error" in result]
+
+def compare(results: list, baseline: dict, tolerance: float, min_delta: float) -> list:
+    failures = errors(results)
+    for result in results:
+        reference = baseline.get(result["name"])
+        if reference is None or "best_s" not in result:
+            continue
+        if result["best_s"] > reference["best_s"] * (1 + tolerance) + min_delta:
+            failures.append(
+                f"{result['name']} {result['best_s']:.4f}s exceeds baseline {reference['best_s']:.4f}s "
+                f"(+{tolerance:.0%} +{min_delta * 1000:.0f}ms)"
+            )
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Daten- und EPV-Pipeline auf einer synthetischen Liga")
+    parser.add_argument("--target", choices=["cache", "postgres"], default="cache")
+    parser.add_argument("--leagues", type=int, default=1)
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--franchises", type=int, default=16)
+    parser.add_argument("--players", type=int, default=1500)
+    parser.add_argument("--weeks", type=int, default=17)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta", type=float, default=0.005, help="Absolute Schwelle in Sekunden zusätzlich zu --tolerance")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--throwaway-db", action="store_true", help="DB_HOST ist eine Wegwerf-Instanz, auch wenn nicht lokal")
+    args = parser.parse_args()
+    if args.target == "postgres":
+        check_database(args.throwaway_db)
+
+    league = generate_league(args.leagues, args.seasons, args.franchises, args.players, args.weeks)
+    seed(args.target, league)
+    results = run_suite(args.target, league, args.repeat)
+
+    for result in results:
+        if "error" in result:
+            print(f"{result['name']:<22} FAILED {result['error']}")
+            continue
+        print(
+            f"{result['name']:<22} rows={result['rows']:>9} best={result['best_s']:.4f}s mean={result['mean_s']:.4f}s "
+            f"rows/s={result['rows_per_s']:>12.0f} rss+={result['rss_growth_mb']:.1f}MB peak={result['peak_rss_mb']:.1f}MB"
+        )
+
+    scale = f"{args.leagues}l-{args.seasons}s-{args.franchises}f-{args.players}p-{args.weeks}w"
+    baseline_path = os.path.join(BASELINE_DIR, f"pipeline_{args.target}_{scale}.json")
+    if args.update_baseline:
+        # Eine Baseline mit fehlenden Benchmarks würde deren Regressionen künftig verdecken
+        failures = errors(results)
+        if failures:
+            for failure in failures:
+                print(f"ERROR: {failure}")
+            print("baseline not written")
+            sys.exit(1)
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump({result["name"]: result for result in results}, f, indent=2)
+        print(f"baseline written to {baseline_path}")
+        return
+
+    failures = errors(results)
+    if os.path.isfile(baseline_path):
+        with open(baseline_path) as f:
+            failures = compare(results, json.load(f), args.tolerance, args.min_delta)
+    for failure in failures:
+        print(f"FAILURE: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bench_startup.py
+#
+# Misst Importzeit und Speicherbedarf (RSS) der Module, die die Web-App beim Start lädt, und prüft,
+# dass dabei weder rpy2 noch das Scraping-Backend geladen werden.
+# Aufruf aus dem Repository-Wurzelverzeichnis:
+#   PYTHONPATH=app python -m benchmarks.bench_startup --repeat 5
+#   PYTHONPATH=app python -m benchmarks.bench_startup --update-baseline
+# Der Exit-Code ist 1, wenn rpy2 geladen wird oder die Baseline um mehr als --tolerance überschritten ist.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Importe von main.py ohne Start der GUI
+STARTUP_MODULES = [
+    "taipy.gui",
+    "pages.home",
+    "pages.extension",
+    "pages.evp",
+    "pages.contracts",
+    "services.data_processing",
+    "services.epv_calculations",
+    "services.paged_table_accessor",
+]
+FORBIDDEN_MODULES = ["rpy2", "services.ffscrapr", "services.mfl_client", "services.ingestion"]
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "startup.json")
+
+_PROBE = """
+import json, sys, time, psutil
+rss_before = psutil.Process().memory_info().rss
+start = time.perf_counter()
+for module in {modules!r}:
+    __import__(module)
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "import_s": seconds,
+    "rss_mb": psutil.Process().memory_info().rss / 1024 ** 2,
+    "rss_growth_mb": (psutil.Process().memory_info().rss - rss_before) / 1024 ** 2,
+    "loaded_forbidden": sorted(m for m in {forbidden!r} if m in sys.modules),
+}}))
+"""
+
+def measure_startup() -> dict:
+    """
+    Importiert die Startmodule in einem frischen Interpreter und gibt Importzeit, RSS und
+    unerwünscht geladene Module zurück.
+    """
+    code = _PROBE.format(modules=STARTUP_MODULES, forbidden=FORBIDDEN_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=os.environ)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Startzeit der Web-App")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Erlaubte relative Überschreitung der Baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    runs = [measure_startup() for _ in range(args.repeat)]
+    result = {
+        "import_s": min(run["import_s"] for run in runs),
+        "rss_mb": min(run["rss_mb"] for run in runs),
+        "loaded_forbidden": sorted({m for run in runs for m in run["loaded_forbidden"]}),
+    }
+    print(f"import={result['import_s']:.3f}s rss={result['rss_mb']:.1f}MB loaded_forbidden={result['loaded_forbidden']}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({"import_s": result["import_s"], "rss_mb": result["rss_mb"]}, f, indent=2)
+        print(f"baseline written to {BASELINE_PATH}")
+        return
+
+    failures = [f"forbidden modules loaded: {result['loaded_forbidden']}"] if result["loaded_forbidden"] else []
+    if os.path.isfile(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+        for key in ("import_s", "rss_mb"):
+            limit = baseline[key] * (1 + args.tolerance)
+            if result[key] > limit:
+                failures.append(f"{key} {result[key]:.2f} exceeds baseline {baseline[key]:.2f} (+{args.tolerance:.0%})")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# check_contracts.py
+#
+# Führt ingestion.build_contracts auf einer kleinen synthetischen Liga (siehe synthetic_league.py) vollständig
+# aus und prüft das Ergebnis gegen die Spalten, die epv_plan und die GUI erwarten.
+# Aufruf aus dem Repository-Wurzelverzeichnis:
+#   PYTHONPATH=app python -m benchmarks.check_contracts
+
+import argparse
+import sys
+import polars as pl
+from benchmarks.synthetic_league import generate_league
+from services.ingestion import build_contracts
+
+REQUIRED_COLUMNS = [
+    "player_id", "season", "player_name", "pos", "is_robust", "tot_pts_rank", "avg_pts_rank", "floor_pts_rank",
+    "franchise_id", "franchise_name", "salary", "contract_years", "contractInfo",
+    "salaryCapAmount", "conference", "division", "logo", "salary_rank",
+]
+
+def check(league: dict) -> list:
+    """
+    Baut die Verträge und gibt die Liste der gefundenen Fehler zurück.
+    """
+    contracts = build_contracts(league["playerscores"], league["roster"], league["franchises"], league["floor_ranks"])
+    failures = []
+    missing = [column for column in REQUIRED_COLUMNS if column not in contracts.columns]
+    if missing:
+        failures.append(f"missing columns {missing}")
+    duplicated = [column for column in contracts.columns if column.endswith("_right")]
+    if duplicated:
+        failures.append(f"join duplicates left over {duplicated}")
+    if contracts.select(["player_id", "season"]).is_duplicated().any():
+        failures.append("more than one row per player_id and season")
+    expected = league["playerscores"].join(league["floor_ranks"], on=["pos", "season"]).select(["player_id", "season"]).n_unique()
+    if contracts.height != expected:
+        failures.append(f"{contracts.height} rows, expected {expected}")
+    if not missing and contracts.get_column("floor_pts_rank").null_count() > 0:
+        failures.append("rows without floor_pts_rank")
+    # Die Berechnung muss mit der Referenz der synthetischen Liga übereinstimmen
+    reference = league["contracts"].select(["player_id", "season", "tot_pts_rank", "avg_pts_rank", "salary_rank"])
+    if not missing:
+        diff = (
+            contracts.select(reference.columns)
+            .join(reference, on=["player_id", "season"], suffix="_ref")
+            .filter(
+                (pl.col("tot_pts_rank") != pl.col("tot_pts_rank_ref"))
+                | (pl.col("avg_pts_rank") != pl.col("avg_pts_rank_ref"))
+                | (pl.col("salary_rank") != pl.col("salary_rank_ref"))
+            )
+        )
+        if diff.height:
+            failures.append(f"{diff.height} rows differ from the reference ranks")
+    print(f"contracts rows={contracts.height} columns={len(contracts.columns)}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="build_contracts auf einer synthetischen Liga prüfen")
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--franchises", type=int, default=8)
+    parser.add_argument("--players", type=int, default=300)
+    args = parser.parse_args()
+
+    failures = check(generate_league(seasons=args.seasons, franchises=args.franchises, players=args.players))
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# check_rate_limit.py
+#
+# Prüft das Ratenlimit des Ingestion-Schedulers gegen den lokalen MFL-Fixture-Server (siehe mfl_fixture_server.py):
+# Die Abrufe laufen über das native Backend in Worker-Prozessen; der Server zählt die tatsächlichen HTTP-Anfragen.
+#   - Die vom TokenBucket berechneten Aufrufe (IngestionJob.calls) müssen den Anfragen am Server entsprechen.
+#   - Der Lauf darf nicht schneller sein, als das Ratenlimit erlaubt.
+# Aufruf aus dem Repository-Wurzelverzeichnis:
+#   PYTHONPATH=app python -m benchmarks.check_rate_limit --calls 3 --seconds 1
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from benchmarks.mfl_fixture_server import serve
+
+def build_jobs(season: int, league_id: int, weeks: list, results: list) -> list:
+    # Erst nach dem Setzen der Umgebung importieren, damit Haupt- und Worker-Prozesse das native Backend nutzen
+    from services.ingestion_scheduler import IngestionJob
+    from services.scraper import fetch_franchises, fetch_playerscores, fetch_rosters, request_count
+
+    jobs = [
+        IngestionJob(f"franchises {season}", fetch_franchises, (season, league_id), results.append, request_count("franchises")),
+        IngestionJob(f"roster {season}", fetch_rosters, (season, league_id), results.append, request_count("rosters")),
+    ]
+    jobs += [
+        IngestionJob(
+            f"playerscores {season} week {week}", fetch_playerscores, (season, league_id, [week]), results.append,
+            request_count("playerscores", 1),
+        )
+        for week in weeks
+    ]
+    return jobs * 2
+
+def check(season: int, league_id: int, weeks: list, calls: int, seconds: float, port: int) -> int:
+    """
+    Führt die Abrufe mit einem TokenBucket von `calls` Aufrufen pro `seconds` Sekunden aus.
+
+    Returns:
+    int: 0, wenn alle Prüfungen bestanden sind, sonst 1.
+    """
+    os.environ["MFL_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["SCRAPER_BACKEND"] = "native"
+    from services.ingestion_scheduler import TokenBucket, run_ingestion
+
+    server = serve(port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        results = []
+        jobs = build_jobs(season, league_id, weeks, results)
+        start = time.perf_counter()
+        run_ingestion(jobs, bucket=TokenBucket(calls, seconds))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    charged = sum(job.calls for job in jobs)
+    requests = len(server.requests)
+    # Ein Token-Bucket erlaubt höchstens `calls` sofort und danach calls/seconds pro Sekunde
+    max_calls = max(job.calls for job in jobs)
+    min_elapsed = max(0.0, (charged - max(calls, max_calls)) * seconds / calls)
+    print(f"jobs={len(jobs)} charged={charged} requests={requests} {dict(Counter(type_ for _, type_ in server.requests))}")
+    print(f"elapsed={elapsed:.2f}s minimum={min_elapsed:.2f}s")
+
+    failures = []
+    if len(results) != len(jobs):
+        failures.append(f"{len(jobs) - len(results)} job(s) without result")
+    if charged != requests:
+        failures.append(f"bucket charged {charged} calls, server saw {requests} requests")
+    if elapsed < min_elapsed:
+        failures.append(f"run took {elapsed:.2f}s, the rate limit allows no less than {min_elapsed:.2f}s")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Ratenlimit des Ingestion-Schedulers gegen den MFL-Fixture-Server prüfen")
+    parser.add_argument("--season", type=int, default=2024)
+    parser.add_argument("--league-id", type=int, default=60206)
+    parser.add_argument("--weeks", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--calls", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+    sys.exit(check(args.season, args.league_id, args.weeks, args.calls, args.seconds, args.port))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# mfl_fixture_server.py
+#
+# Lokaler Server mit aufgezeichneten MFL-Antworten, um das native Scraping-Backend ohne Netzwerk
+# und ohne Ratenlimit zu prüfen.
+#
+# Die Fixtures unter fixtures/mfl/2024 bilden eine kleine Liga (4 Franchises, 28 Spieler, Wochen 1 und 2)
+# im Format der MFL-Export-API nach und werden ohne Netzwerk mitgeliefert.
+#
+# Antworten aufzeichnen (einmalig, gegen die echte API):
+#   PYTHONPATH=app python -m benchmarks.mfl_fixture_server --record --season 2024 --weeks 1 2
+# Server starten und das Backend dagegen laufen lassen:
+#   PYTHONPATH=app python -m benchmarks.mfl_fixture_server --serve --port 8765
+#   MFL_BASE_URL=http://localhost:8765 SCRAPER_BACKEND=native MFL_RATE_LIMIT_SECONDS=0 ...
+# Aufzeichnung prüfen (startet den Server im Hintergrund und ruft alle Endpunkte über das Backend ab):
+#   PYTHONPATH=app python -m benchmarks.mfl_fixture_server --check --season 2024 --weeks 1 2
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import httpx
+from services.mfl_client import MFLClient
+from config.config import LEAGUE_ID
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "mfl")
+
+def fixture_path(season: int, type_: str, week=None, fixture_dir: str = FIXTURE_DIR) -> str:
+    name = f"{type_}_W{int(week):02d}.json" if week is not None else f"{type_}.json"
+    return os.path.join(fixture_dir, str(season), name)
+
+def record(season: int, league_id: int, weeks: list, fixture_dir: str = FIXTURE_DIR) -> None:
+    """
+    Zeichnet die vom nativen Backend benötigten Endpunkte der echten MFL-API als JSON-Dateien auf.
+    """
+    requests = [("league", {}), ("rosters", {}), ("players", {"DETAILS": 1})]
+    requests += [("playerScores", {"W": week, "YEAR": season}) for week in weeks]
+    with httpx.Client(follow_redirects=True, timeout=30.0) as client:
+        for type_, params in requests:
+            response = client.get(
+                f"https://api.myfantasyleague.com/{season}/export",
+                params={"TYPE": type_, "L": league_id, "JSON": 1, **params},
+            )
+            response.raise_for_status()
+            path = fixture_path(season, type_, params.get("W"), fixture_dir)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(response.json(), f)
+            print(f"recorded {path}")
+            time.sleep(6)
+
+def make_handler(fixture_dir: str):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            # Zeitpunkt und Endpunkt jeder Anfrage festhalten (z.B. für die Prüfung des Ratenlimits)
+            self.server.requests.append((time.monotonic(), query.get("TYPE", "")))
+            season = url.path.strip("/").split("/")[0]
+            path = fixture_path(season, query.get("TYPE", ""), query.get("W"), fixture_dir)
+            if not os.path.isfile(path):
+                self.send_error(404, f"No fixture {path}")
+                return
+            with open(path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FixtureHandler
+
+def serve(port: int, fixture_dir: str = FIXTURE_DIR) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fixture_dir))
+    server.requests = []
+    return server
+
+def check(season: int, league_id: int, weeks: list, port: int) -> None:
+    """
+    Startet den Fixture-Server im Hintergrund und ruft alle Endpunkte über das native Backend ab.
+    """
+    os.environ["MFL_BASE_URL"] = f"http://127.0.0.1:{port}"
+    server = serve(port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        async def fetch_all():
+            async with MFLClient(season, league_id, base_url=os.environ["MFL_BASE_URL"], seconds=0.0) as client:
+                players = await client.players()
+                return {
+                    "franchises": await client.franchises(),
+                    "rosters": await client.rosters(),
+                    "players": players,
+                    "playerscores": await client.playerscores(weeks, players),
+                    "starter_positions": await client.starter_positions(),
+                }
+
+        start = time.perf_counter()
+        frames = asyncio.run(fetch_all())
+        print(f"fetched in {time.perf_counter() - start:.3f}s")
+        for name, df in frames.items():
+            assert df.height > 0, f"{name} is empty"
+            print(f"{name:<18} rows={df.height:>6} columns={df.columns}")
+
+        # Vertragsfelder werden für die EPV-Berechnung benötigt (contractInfo -> YO5)
+        for column in ("contractInfo", "contractStatus", "drafted"):
+            assert column in frames["rosters"].columns, f"rosters misses {column}"
+        assert frames["rosters"].get_column("player_name").null_count() == 0, "rosters without player names"
+        assert frames["playerscores"].get_column("pos").null_count() == 0, "playerscores without positions"
+        # Spielerliste: einmal für rosters, einmal vorab; die Wochen-Abrufe laden sie nicht erneut
+        players_calls = sum(1 for _, type_ in server.requests if type_ == "players")
+        assert players_calls == 2, f"players fetched {players_calls} times"
+        print(f"requests: {len(server.requests)} ok")
+    finally:
+        server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Aufgezeichnete MFL-Antworten für das native Scraping-Backend")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--record", action="store_true")
+    mode.add_argument("--serve", action="store_true")
+    mode.add_argument("--check", action="store_true")
+    parser.add_argument("--season", type=int, default=2024)
+    parser.add_argument("--league-id", type=int, default=LEAGUE_ID)
+    parser.add_argument("--weeks", type=int, nargs="+", default=[1])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.season, args.league_id, args.weeks)
+    elif args.serve:
+        print(f"serving {FIXTURE_DIR} on http://127.0.0.1:{args.port}")
+        serve(args.port).serve_forever()
+    else:
+        check(args.season, args.league_id, args.weeks, args.port)
+
+if __name__ == "__main__":
+    main()
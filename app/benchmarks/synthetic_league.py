@@ -0,0 +1,107 @@
+# synthetic_league.py
+#
+# Erzeugt synthetische Ligadaten (playerscores, roster, franchises, contracts) in beliebigem Umfang
+# mit denselben Spalten wie die echten Tabellen.
+
+import numpy as np
+import polars as pl
+
+POSITIONS = ["QB", "RB", "WR", "TE", "PK", "DEF"]
+
+def generate_league(leagues: int = 1, seasons: int = 5, franchises: int = 16, players: int = 1500,
+                    weeks: int = 17, start_season: int = 2020, seed: int = 42) -> dict:
+    """
+    Erzeugt eine synthetische Liga.
+
+    Parameters:
+    leagues (int): Anzahl Ligen; jede Liga hat eigene Franchises (Conference = Liga-Nummer).
+    seasons (int): Anzahl Saisons ab `start_season`.
+    franchises (int): Franchises pro Liga.
+    players (int): Spieler im Pool (pro Saison bewertet und auf die Franchises verteilt).
+    weeks (int): Spielwochen pro Saison.
+    seed (int): Startwert des Zufallsgenerators.
+
+    Returns:
+    dict: Polars DataFrames unter den Schlüsseln playerscores, roster, franchises, floor_ranks und contracts.
+    """
+    rng = np.random.default_rng(seed)
+    season_list = list(range(start_season, start_season + seasons))
+    player_ids = np.arange(10000, 10000 + players, dtype=np.int32)
+    player_pos = rng.choice(POSITIONS, players)
+    player_skill = rng.gamma(2.0, 5.0, players)
+
+    franchise_df = pl.DataFrame({
+        "franchise_id": [f"{league:02d}{f:02d}" for league in range(leagues) for f in range(1, franchises + 1)],
+        "franchise_name": [f"Team {league}-{f}" for league in range(leagues) for f in range(1, franchises + 1)],
+        "conference": [f"{league:02d}" for league in range(leagues) for _ in range(franchises)],
+        "division": [f"{league:02d}{f % 4}" for league in range(leagues) for f in range(franchises)],
+        "logo": [f"https://example.com/logo/{league}/{f}.png" for league in range(leagues) for f in range(franchises)],
+        "salaryCapAmount": [300.0] * (leagues * franchises),
+    })
+    franchise_df = pl.concat([franchise_df.with_columns(season=pl.lit(season, pl.Int32)) for season in season_list])
+
+    n = players * seasons * weeks
+    playerscores = pl.DataFrame({
+        "season": np.repeat(np.array(season_list, dtype=np.int32), players * weeks),
+        "week": np.tile(np.repeat(np.arange(1, weeks + 1, dtype=np.int32), players), seasons),
+        "player_id": np.tile(player_ids, seasons * weeks),
+        "pos": np.tile(player_pos, seasons * weeks),
+        "points": np.round(np.tile(player_skill, seasons * weeks) * rng.uniform(0.2, 1.8, n), 2),
+    }).with_columns(
+        player_name=pl.format("Player {}", "player_id"),
+        team=pl.lit("FA"),
+    )
+
+    franchise_ids = franchise_df.filter(pl.col("season") == season_list[0]).select("franchise_id", "franchise_name", "conference").unique()
+    roster = pl.concat([
+        pl.DataFrame({
+            "player_id": player_ids,
+            "pos": player_pos,
+            "franchise_id": rng.choice(franchise_ids.get_column("franchise_id").to_numpy(), players),
+            "salary": np.round(rng.gamma(1.5, 4.0, players), 1),
+            "contract_years": rng.integers(0, 5, players).astype(np.int32),
+            "contractInfo": rng.choice(["", "5YO"], players, p=[0.9, 0.1]),
+            "season": np.full(players, season, dtype=np.int32),
+        })
+        for season in season_list
+    ]).join(franchise_ids.select("franchise_id", "franchise_name"), on="franchise_id", how="left")
+
+    # Wie league_settings.get_floor_pts_ranks mit zwei Pflicht-Startern pro Position
+    floor_ranks = pl.DataFrame(
+        {
+            "pos": [pos for _ in season_list for pos in POSITIONS],
+            "season": [season for season in season_list for _ in POSITIONS],
+            "floor_pts_rank": [franchises * 2] * (len(season_list) * len(POSITIONS)),
+        },
+        schema={"pos": pl.Utf8, "season": pl.Int32, "floor_pts_rank": pl.UInt32},
+    )
+
+    contracts = (
+        playerscores
+        .group_by(["player_id", "season"])
+        .agg(
+            player_name=pl.col("player_name").first(),
+            pos=pl.col("pos").first(),
+            team=pl.col("team").first(),
+            num_games=pl.col("points").count(),
+            tot_pts=pl.col("points").sum(),
+            avg_pts=pl.col("points").mean(),
+        )
+        .with_columns(is_robust=pl.col("num_games") >= 5)
+        .with_columns(
+            tot_pts_rank=pl.col("tot_pts").rank("max", descending=True).over(["pos", "season"]),
+            avg_pts_rank=pl.col("avg_pts").rank("max", descending=True).over(["pos", "season"]),
+        )
+        .join(floor_ranks, on=["pos", "season"])
+        .join(roster.drop("pos"), on=["player_id", "season"], how="left")
+        .join(
+            franchise_df.select(["franchise_id", "season", "salaryCapAmount", "conference", "division", "logo"]),
+            on=["franchise_id", "season"],
+            how="left",
+        )
+        .with_columns(
+            salary_rank=pl.col("salary").rank("ordinal", descending=True).over(["pos", "season", "conference"])
+        )
+    )
+
+    return {"playerscores": playerscores, "roster": roster, "franchises": franchise_df, "floor_ranks": floor_ranks, "contracts": contracts}
@@ -15,5 +15,64 @@ db_config = {
 START_YEAR = 2020
 DEFAULT_SEASON = 2024
 LEAGUE_ID = 60206
+# Alle verwalteten Ligen (kommagetrennt); die erste ist die Standardauswahl der GUI
+LEAGUE_IDS = [int(league_id) for league_id in os.getenv("LEAGUE_IDS", str(LEAGUE_ID)).split(",") if league_id.strip()]
+# Parallele Worker-Prozesse beim Datenbank-Update (je eine Liga mit eigenem Ratenlimit)
+LEAGUE_WORKERS = int(os.getenv("LEAGUE_WORKERS", 4))
 DEFAULT_TEAM = "New York Jets"
 DEFAULT_WEEK = 0
+
+# Verbindungspool
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", 1))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 5))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # Sekunden Wartezeit auf eine freie Verbindung
+DB_POOL_HEALTHCHECK_SECONDS = float(os.getenv("DB_POOL_HEALTHCHECK_SECONDS", 60))  # Leerlauf vor erneuter Prüfung
+
+# Lesepfad für Tabellen: "copy" (COPY ... TO STDOUT, spaltenweise) oder "fetch" (fetchall, zeilenweise)
+DB_READ_METHOD = os.getenv("DB_READ_METHOD", "copy")
+
+# Cache-Konfiguration (Sekunden, bis ein Tabellen-Snapshot neu geladen wird).
+# Der Cache ist prozesslokal; nach einem Datenbank-Update (eigener Prozess) gilt nur diese TTL.
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 300))
+
+# EPV-Berechnung: optimierten Polars-Abfrageplan ins Log schreiben
+EPV_EXPLAIN = os.getenv("EPV_EXPLAIN", "0") == "1"
+
+# Maximale Anzahl gleichzeitig laufender Hintergrundberechnungen (EPVs) über alle Sessions
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", 4))
+# Sekunden ohne Nutzung, nach denen die Tabellen-Bearbeitungen einer Session verworfen werden
+EDIT_SESSION_TTL_SECONDS = int(os.getenv("EDIT_SESSION_TTL_SECONDS", 12 * 3600))
+# Intervall (Millisekunden), in dem der Fortschritt einer Hintergrundberechnung gemeldet wird
+BACKGROUND_STATUS_PERIOD_MS = int(os.getenv("BACKGROUND_STATUS_PERIOD_MS", 500))
+
+# Längste Vertragsverlängerung (Jahre), für die EPVs beim Datenbank-Update vorberechnet werden
+EPV_MAX_EXTENSION_YEARS = int(os.getenv("EPV_MAX_EXTENSION_YEARS", 5))
+
+# Scraping: parallele Worker-Prozesse (je eine R-Instanz) und globales MFL-Ratenlimit
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", 2))
+MFL_RATE_LIMIT_CALLS = int(os.getenv("MFL_RATE_LIMIT_CALLS", 1))
+MFL_RATE_LIMIT_SECONDS = float(os.getenv("MFL_RATE_LIMIT_SECONDS", 6))
+
+# Scraping-Backend: "ffscrapr" (R über rpy2) oder "native" (asynchroner Python-Client)
+SCRAPER_BACKEND = os.getenv("SCRAPER_BACKEND", "ffscrapr")
+MFL_BASE_URL = os.getenv("MFL_BASE_URL", "https://api.myfantasyleague.com")
+MFL_MAX_RETRIES = int(os.getenv("MFL_MAX_RETRIES", 3))
+
+# Plattencache der Ligaeinstellungen (Starter-Positionen, Franchises, Salary Cap) pro Saison und Liga
+LEAGUE_SETTINGS_DIR = os.getenv("LEAGUE_SETTINGS_DIR", "data/league_settings")
+
+# Ablage der Spieler-Scores (partitioniert nach Saison und Woche)
+PLAYERSCORES_STORE_DIR = os.getenv("PLAYERSCORES_STORE_DIR", "data/playerscores")
+# Zusammengefasste, per Memory-Mapping lesbare Arrow-IPC-Datei aller Spieler-Scores
+PLAYERSCORES_CACHE_PATH = os.getenv("PLAYERSCORES_CACHE_PATH", "data/playerscores.arrow")
+
+# Session-Frames als Arrow-basierte pandas-Spalten ablegen
+FRAME_BRIDGE_ARROW = os.getenv("FRAME_BRIDGE_ARROW", "1") == "1"
+
+# Metrik-Endpunkt (Prometheus-Textformat) neben dem Taipy-Server; 0 schaltet ihn ab
+METRICS_PORT = int(os.getenv("METRICS_PORT", 9100))
+# Ablage der Metriken von Prozessen ohne Endpunkt (Datenbank-Update) als .prom-Dateien; leer schaltet sie ab
+METRICS_TEXTFILE_DIR = os.getenv("METRICS_TEXTFILE_DIR", "metrics")
+# Kommagetrennte Stufennamen (z.B. "epv.collect,db.query") oder "all", die unter cProfile laufen
+PROFILE_STAGES = {stage.strip() for stage in os.getenv("PROFILE_STAGES", "").split(",") if stage.strip()}
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
@@ -1,30 +1,61 @@
 # main.py
 
-from taipy.gui import Gui, Icon, navigate, notify
+import polars as pl
+from taipy.gui import Gui, Icon, get_state_id, navigate, notify
 from pages.home import home_page
 from pages.extension import extension_page
 from pages.evp import ext_page
-from services.data_processing import filter_table, get_unique_teams, get_seasons, get_weeks
-from services.epv_calculations import calculate_epvs
+from pages.contracts import contracts_page
+from services.data_processing import filter_table, get_unique_teams, get_seasons, get_weeks, league_contracts
+from services.epv_calculations import calculate_epvs, cancel_epvs
+from services.edit_overlay import apply_overlay, cast_value, clear_edits, record_edit
+from services.paged_table import PagedTable
+from services.paged_table_accessor import register_paged_tables
+from services.metrics import start_metrics_server
+from config.config import LEAGUE_IDS
 
 # Initialisiere gefilterte DataFrame-Variable
 filtered_df = None
+# ID der laufenden EPV-Hintergrundberechnung der Session
+epv_job_id = None
 
-# Abrufen der einzigartigen Teamnamen und Saisons
-teams = get_unique_teams()
-seasons = get_seasons()
+# Abrufen der Ligen sowie der einzigartigen Teamnamen und Saisons der ersten Liga
+leagues = LEAGUE_IDS
+selected_league = leagues[0]
+teams = get_unique_teams(selected_league)
+seasons = get_seasons(selected_league)
+# Alle Verträge der Liga über alle Saisons (seitenweise aus der Datenbank)
+all_contracts = league_contracts(selected_league)
 weeks = get_weeks()
 
-# Initiale Auswahl
-selected_team = teams[0]
-selected_season = seasons[0]
+# Initiale Auswahl; eine Liga ohne eingelesene Daten hat noch keine Teams und Saisons
+selected_team = teams[0] if teams else None
+selected_season = seasons[0] if seasons else None
 selected_weeks = weeks[0]
 
+# Ligawechsel: Teams und Saisons der Liga aus den gecachten Sichten filtern
+def league_on_change(state, var_name, value):
+    # Der Selector liefert die Auswahl ggf. als Text
+    league_id = int(value)
+    state.teams = get_unique_teams(league_id)
+    state.seasons = get_seasons(league_id)
+    state.all_contracts = league_contracts(league_id)
+    state.selected_team = state.teams[0] if state.teams else None
+    state.selected_season = state.seasons[0] if state.seasons else None
+    if not state.teams:
+        notify(state, "warning", f"League {league_id} has no data yet. Run the database update first.")
+    # Bearbeitungen sind nach player_id gespeichert und gelten nur innerhalb einer Liga
+    clear_edits(get_state_id(state))
+
 # Seiten- und Filterlogik
 def filter_and_navigate(state):
-    state.filtered_df = filter_table(state.selected_team[0], state.selected_season)
-    # state.filtered_df = state.filtered_df.with_columns(week=state.selected_weeks)
-    state.filtered_df = state.filtered_df.assign(week=state.selected_weeks)
+    if state.selected_team is None or state.selected_season is None:
+        notify(state, "warning", "Select a team and season first.")
+        return
+    contracts_df = filter_table(state.selected_team[0], state.selected_season, int(state.selected_league))
+    # Frühere Bearbeitungen der Session wieder anzeigen
+    contracts_df = apply_overlay(contracts_df, get_state_id(state))
+    state.filtered_df = PagedTable(contracts_df.with_columns(week=pl.lit(state.selected_weeks)))
     navigate(state, "extension")
     notify(state, "success", f'Clicked on team: {state.selected_team[0]}')
 
@@ -36,10 +67,18 @@ def contract_years_on_edit(state, var_name, payload):
     index = payload["index"]
     col = payload["col"]
     value = payload["value"]
-    old_value = state.filtered_df.loc[index, col]
-    new_filtered_df = state.filtered_df.copy()
-    new_filtered_df.loc[index, col] = value
-    state.filtered_df = new_filtered_df
+    row = state.filtered_df.row(index)
+    old_value = row[col]
+    # Ungültige Eingaben abweisen, bevor sie gespeichert werden (sonst würden sie zu null)
+    try:
+        value = cast_value(value, state.filtered_df.schema()[col])
+    except ValueError:
+        notify(state, "E", f"Invalid value '{value}' for column '{col}'.")
+        return
+    # Nur das Delta speichern und die Zelle direkt ändern; Taipy lädt danach nur die sichtbare Seite neu
+    record_edit(get_state_id(state), int(row["season"]), int(row["player_id"]), col, value)
+    state.filtered_df.set_cell(index, col, value)
+    state.refresh("filtered_df")
     notify(state, "I", f"Edited value from '{old_value}' to '{value}'. (index '{index}', column '{col}')")
 
 # Seitenkonfiguration
@@ -48,6 +87,7 @@ pages = {
     "home": home_page,
     "extension": extension_page,
     "epv": ext_page,
+    "contracts": contracts_page,
 }
 page_names = [page for page in pages.keys() if page != "/"]
 
@@ -55,6 +95,9 @@ def menu_action(state, action, payload):
     page = payload["args"][0]
     navigate(state, page)
 
-# Taipy GUI starten
+# Metrik-Endpunkt und Taipy GUI starten
+start_metrics_server()
 gui = Gui(pages=pages)
+# Tabellen mit PagedTable laden nur die sichtbare Seite (Sortierung und Filter serverseitig)
+register_paged_tables(gui)
 gui.run(host="0.0.0.0", port=8080, run_browser=True, use_reloader=True)
\ No newline at end of file
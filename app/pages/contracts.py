@@ -0,0 +1,10 @@
+contracts_page = """
+<|navbar|>
+# Alle Verträge der Liga
+
+<|button|label=Zurück|on_action=navigate_to_selection|>
+
+**Verträge aller Saisons:**
+<|{all_contracts}|table|page_size=50|filter=True|editable=false|height=600px|width=100%|>
+
+"""
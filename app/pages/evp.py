@@ -6,6 +6,6 @@ ext_page = """
 <|button|label=Zurück|on_action=navigate_to_selection|>
 
 **Extensions:**
-<|{filtered_df}|table|editable=false|height=400px|width=100%|>
+<|{filtered_df}|table|page_size=50|editable=false|height=400px|width=100%|>
 
 """
\ No newline at end of file
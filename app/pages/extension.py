@@ -6,7 +6,8 @@ extension_page = """
 <|button|label=Zurück|on_action=navigate_to_selection|>
 
 **Verträge:**
-<|{filtered_df}|table|filter=True|editable=false|editable[contract_years]=true|on_edit=contract_years_on_edit|height=400px|width=100%|>
+<|{filtered_df}|table|page_size=50|filter=True|editable=false|editable[contract_years]=true|on_edit=contract_years_on_edit|height=400px|width=100%|>
 
-<|button|label=EPVs berechnen|on_action=calculate_epvs|>
+<|button|label=EPVs berechnen|on_action=calculate_epvs|active={epv_job_id is None}|>
+<|button|label=Berechnung abbrechen|on_action=cancel_epvs|active={epv_job_id is not None}|>
 """
\ No newline at end of file
@@ -4,6 +4,9 @@ home_page = """
 <|navbar|>
 # Team und Saison Auswahl
 
+**Wähle eine Liga:**
+<|{selected_league}|selector|lov={leagues}|dropdown|on_change=league_on_change|>
+
 <|layout|columns=1fr auto 1fr|
 <|layout|direction=column|
 **Wähle ein Team:**
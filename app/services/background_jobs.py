@@ -0,0 +1,79 @@
+# background_jobs.py
+
+import threading
+import uuid
+from config.config import BACKGROUND_WORKERS
+
+# Registry für Hintergrundberechnungen, die über taipy.gui.invoke_long_callback laufen.
+# Der Hintergrund-Thread meldet hier seine aktuelle Stufe und prüft auf Abbruch;
+# die Status-Callbacks im GUI-Thread lesen Stufe und Ergebnis über die Job-ID (z.B. state.epv_job_id).
+
+class JobCancelled(Exception):
+    """Wird im Hintergrund-Thread ausgelöst, wenn der Job abgebrochen wurde."""
+
+_jobs: dict = {}
+_lock = threading.Lock()
+# Begrenzt die Anzahl gleichzeitig rechnender Jobs über alle Sessions
+_slots = threading.BoundedSemaphore(BACKGROUND_WORKERS)
+
+def create_job(name: str) -> str:
+    """
+    Legt einen Job an und gibt seine ID zurück.
+    """
+    job_id = uuid.uuid4().hex
+    with _lock:
+        _jobs[job_id] = {"name": name, "stage": "wartet", "reported": None, "cancelled": threading.Event()}
+    return job_id
+
+def get_job(job_id: str):
+    with _lock:
+        return _jobs.get(job_id)
+
+def set_stage(job_id: str, stage: str) -> None:
+    """
+    Setzt die aktuelle Stufe eines Jobs. Wurde der Job abgebrochen, wird JobCancelled ausgelöst,
+    sodass die Berechnung zwischen zwei Stufen endet.
+
+    Raises:
+    JobCancelled: Wenn der Job abgebrochen wurde.
+    """
+    job = get_job(job_id)
+    if job is None or job["cancelled"].is_set():
+        raise JobCancelled(job_id)
+    job["stage"] = stage
+
+def next_stage_report(job_id: str):
+    """
+    Gibt die aktuelle Stufe zurück, wenn sie seit dem letzten Aufruf noch nicht gemeldet wurde, sonst None.
+    """
+    job = get_job(job_id)
+    if job is None or job["stage"] == job["reported"]:
+        return None
+    job["reported"] = job["stage"]
+    return job["stage"]
+
+def cancel_job(job_id: str) -> bool:
+    """
+    Markiert einen Job als abgebrochen. Gibt False zurück, wenn der Job nicht (mehr) existiert.
+    """
+    job = get_job(job_id)
+    if job is None:
+        return False
+    job["cancelled"].set()
+    return True
+
+def is_cancelled(job_id: str) -> bool:
+    job = get_job(job_id)
+    return job is None or job["cancelled"].is_set()
+
+def finish_job(job_id: str) -> None:
+    with _lock:
+        _jobs.pop(job_id, None)
+
+def run_job(job_id: str, function, *args):
+    """
+    Führt `function(job_id, *args)` aus, sobald ein Slot frei ist.
+    """
+    set_stage(job_id, "wartet auf freien Rechen-Slot")
+    with _slots:
+        return function(job_id, *args)
@@ -0,0 +1,99 @@
+# bulk_writer.py
+
+import io
+import logging
+import polars as pl
+import psycopg2
+from psycopg2 import sql
+
+# Polars-Datentypen -> PostgreSQL-Spaltentypen
+PG_COLUMN_TYPES = {
+    pl.Boolean: "BOOLEAN",
+    pl.Int8: "SMALLINT",
+    pl.Int16: "SMALLINT",
+    pl.Int32: "INTEGER",
+    pl.Int64: "BIGINT",
+    pl.UInt8: "SMALLINT",
+    pl.UInt16: "INTEGER",
+    pl.UInt32: "BIGINT",
+    pl.UInt64: "NUMERIC",
+    pl.Float32: "REAL",
+    pl.Float64: "DOUBLE PRECISION",
+    pl.Utf8: "TEXT",
+    pl.Date: "DATE",
+    pl.Datetime: "TIMESTAMP",
+}
+
+def pg_column_type(dtype) -> str:
+    """
+    Gibt den PostgreSQL-Spaltentyp für einen Polars-Datentyp zurück. Unbekannte Typen werden als TEXT gespeichert.
+    """
+    return PG_COLUMN_TYPES.get(dtype.base_type(), "TEXT")
+
+def ensure_table(cursor, table: str, df: pl.DataFrame) -> None:
+    """
+    Legt die Zieltabelle mit typisierten Spalten an, falls sie fehlt, und ergänzt fehlende Spalten.
+    """
+    columns = sql.SQL(", ").join(
+        sql.SQL("{} {}").format(sql.Identifier(name), sql.SQL(pg_column_type(dtype)))
+        for name, dtype in df.schema.items()
+    )
+    cursor.execute(sql.SQL("CREATE TABLE IF NOT EXISTS {} ({})").format(sql.Identifier(table), columns))
+    for name, dtype in df.schema.items():
+        cursor.execute(
+            sql.SQL("ALTER TABLE {} ADD COLUMN IF NOT EXISTS {} {}").format(
+                sql.Identifier(table), sql.Identifier(name), sql.SQL(pg_column_type(dtype))
+            )
+        )
+
+def copy_frame(cursor, table: str, df: pl.DataFrame) -> None:
+    """
+    Streamt einen Polars DataFrame per COPY ... FROM STDIN in die Tabelle.
+    """
+    buffer = io.BytesIO()
+    df.write_csv(buffer)
+    buffer.seek(0)
+    query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, HEADER true)").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(sql.Identifier(name) for name in df.columns),
+    )
+    cursor.copy_expert(query.as_string(cursor), buffer)
+
+def write_frame(conn, table: str, df: pl.DataFrame, season=None, league_id: int = None) -> None:
+    """
+    Schreibt einen Polars DataFrame in einer Transaktion in die Datenbank.
+
+    Ist `season` angegeben, werden vorhandene Zeilen dieser Saison(s) vorher gelöscht, sodass das
+    Laden wiederholbar ist. Mit `league_id` beschränkt sich das Löschen auf diese Liga.
+
+    Parameters:
+    conn: Offene psycopg2-Verbindung.
+    table (str): Der Name der Zieltabelle.
+    df (pl.DataFrame): Die zu schreibenden Daten.
+    season (int | list): Die Saison bzw. Liste von Saisons, die ersetzt wird.
+    league_id (int): Die Liga, deren Saisons ersetzt werden.
+
+    Raises:
+    psycopg2.Error: Wenn das Schreiben fehlschlägt. Die Transaktion wird dann zurückgerollt.
+    """
+    try:
+        with conn.cursor() as cursor:
+            ensure_table(cursor, table, df)
+            if season is not None:
+                seasons = list(season) if isinstance(season, (list, tuple, set)) else [season]
+                if league_id is None:
+                    cursor.execute(
+                        sql.SQL("DELETE FROM {} WHERE season = ANY(%s)").format(sql.Identifier(table)), (seasons,)
+                    )
+                else:
+                    cursor.execute(
+                        sql.SQL("DELETE FROM {} WHERE season = ANY(%s) AND league_id = %s").format(sql.Identifier(table)),
+                        (seasons, league_id),
+                    )
+            copy_frame(cursor, table, df)
+        conn.commit()
+        logging.info(f"{df.height} Zeilen per COPY in Tabelle '{table}' geschrieben.")
+    except psycopg2.Error as e:
+        conn.rollback()
+        logging.error(f"Fehler beim Schreiben in Tabelle '{table}': {e}")
+        raise
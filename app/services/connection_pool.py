@@ -0,0 +1,119 @@
+# connection_pool.py
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions, pool
+from services.metrics import span
+from config.config import db_config, DB_POOL_MIN, DB_POOL_MAX, DB_POOL_TIMEOUT, DB_POOL_HEALTHCHECK_SECONDS
+
+_pool = None
+_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+_lock = threading.Lock()
+_last_used: dict = {}
+_stats = {
+    "checkouts": 0,
+    "connections_replaced": 0,
+    "timeouts": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+}
+
+def get_pool() -> pool.ThreadedConnectionPool:
+    """
+    Gibt den prozessweiten Verbindungspool zurück und legt ihn beim ersten Aufruf an.
+    """
+    global _pool
+    with _lock:
+        if _pool is None or _pool.closed:
+            _pool = pool.ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, **db_config)
+            logging.info(f"Verbindungspool angelegt (min={DB_POOL_MIN}, max={DB_POOL_MAX}).")
+        return _pool
+
+def _is_healthy(conn) -> bool:
+    """
+    Prüft eine Verbindung aus dem Pool. Verbindungen, die kürzlich benutzt wurden, gelten ohne Abfrage als gesund.
+    """
+    if conn.closed:
+        return False
+    if time.monotonic() - _last_used.get(id(conn), 0) < DB_POOL_HEALTHCHECK_SECONDS:
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+@contextmanager
+def get_connection():
+    """
+    Leiht eine Verbindung aus dem Pool aus und gibt sie nach dem with-Block zurück.
+    Offene Transaktionen werden dabei zurückgerollt; Commits sind Aufgabe des Aufrufers.
+
+    Beispiel:
+        with get_connection() as conn:
+            ...
+
+    Raises:
+    psycopg2.pool.PoolError: Wenn innerhalb von DB_POOL_TIMEOUT Sekunden keine Verbindung frei wird.
+    """
+    start = time.monotonic()
+    with span("db.pool_wait"):
+        if not _slots.acquire(timeout=DB_POOL_TIMEOUT):
+            with _lock:
+                _stats["timeouts"] += 1
+            raise pool.PoolError(f"Keine freie Datenbankverbindung nach {DB_POOL_TIMEOUT} Sekunden.")
+
+    conn = None
+    db_pool = get_pool()
+    try:
+        with span("db.connect"):
+            conn = db_pool.getconn()
+            if not _is_healthy(conn):
+                logging.warning("Ungesunde Datenbankverbindung im Pool ersetzt.")
+                db_pool.putconn(conn, close=True)
+                _last_used.pop(id(conn), None)
+                conn = db_pool.getconn()
+                with _lock:
+                    _stats["connections_replaced"] += 1
+
+        wait = time.monotonic() - start
+        with _lock:
+            _stats["checkouts"] += 1
+            _stats["wait_seconds_total"] += wait
+            _stats["wait_seconds_max"] = max(_stats["wait_seconds_max"], wait)
+
+        yield conn
+    finally:
+        if conn is not None:
+            if not conn.closed and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            _last_used[id(conn)] = time.monotonic()
+            db_pool.putconn(conn, close=bool(conn.closed))
+        _slots.release()
+
+def pool_stats() -> dict:
+    """
+    Gibt Statistiken über den Pool zurück (Anzahl Ausleihen, Wartezeiten, ersetzte Verbindungen).
+    """
+    with _lock:
+        stats = dict(_stats)
+    stats["wait_seconds_mean"] = stats["wait_seconds_total"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    stats["in_use"] = DB_POOL_MAX - _slots._value
+    return stats
+
+def close_pool() -> None:
+    """
+    Schließt alle Verbindungen des Pools.
+    """
+    global _pool
+    with _lock:
+        if _pool is not None and not _pool.closed:
+            _pool.closeall()
+            logging.info("Verbindungspool geschlossen.")
+        _pool = None
+        _last_used.clear()
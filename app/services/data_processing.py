@@ -2,63 +2,118 @@
 import pandas as pd
 import polars as pl
 from taipy.gui import Icon
-from services.database_service import create_connection, load_table_from_db
+from services.database_service import load_table_from_db
+from services.snapshot_cache import get_snapshot, peek
+from services.paged_table import PagedTable
+from services.query import Filter, apply_query
 
-def load_contracts() -> pl.DataFrame:
-    db_config = create_connection()
-    contracts_df = load_table_from_db("contracts",db_config)
-    return contracts_df
+def _load_table(table: str, columns: list = None, filters: list = None) -> pl.DataFrame:
+    return load_table_from_db(table, columns=columns, filters=filters)
 
-def load_salaries() -> pl.DataFrame:
-    db_config = create_connection()
-    contracts_df = load_table_from_db("roster",db_config).select(["season", "salary", "pos"])
-    return contracts_df
+def _query_table(table: str, columns: list = None, filters: list = None) -> pl.DataFrame:
+    """
+    Ohne Spalten und Filter wird der gecachte Snapshot zurückgegeben. Sonst wird ein bereits
+    gültiger Snapshot lokal gefiltert oder die Abfrage an die Datenbank übergeben.
+    """
+    if not columns and not filters:
+        return get_snapshot(table, lambda: _load_table(table))
+    cached_df = peek(table)
+    if cached_df is not None:
+        return apply_query(cached_df, columns, filters)
+    return _load_table(table, columns, filters)
 
-def filter_table(team: str, season: int) -> pl.DataFrame:
-    """
-    Filtert die Vertragsdaten basierend auf Team und Saison.
-    """
-    contracts_df = load_contracts() 
-    contracts_df = (
-        contracts_df
-        .filter(
-            (pl.col("franchise_name") == team) &
-            (pl.col("season") == season) &
-            (pl.col("contract_years") <= 1)
-        )
-        .select(["conference", "franchise_name", "player_id", "player_name", "pos", "salary", "contract_years"])
-        .sort(by=pl.col("pos"))
-        .to_pandas()
+def load_contracts(columns: list = None, filters: list = None) -> pl.DataFrame:
+    """
+    Lädt die Tabelle 'contracts'. Ohne Argumente wird der prozessweit gecachte Snapshot zurückgegeben.
+    """
+    return _query_table("contracts", columns, filters)
+
+def load_roster(columns: list = None, filters: list = None) -> pl.DataFrame:
+    """
+    Lädt die Tabelle 'roster'. Ohne Argumente wird der prozessweit gecachte Snapshot zurückgegeben.
+    """
+    return _query_table("roster", columns, filters)
+
+def load_franchise_table(columns: list = None, filters: list = None) -> pl.DataFrame:
+    """
+    Lädt die Tabelle 'franchises'. Ohne Argumente wird der prozessweit gecachte Snapshot zurückgegeben.
+    """
+    return _query_table("franchises", columns, filters)
+
+def load_epv_table(columns: list = None, filters: list = None) -> pl.DataFrame:
+    """
+    Lädt die vorberechneten EPVs aus der Tabelle 'epv'.
+    """
+    return _query_table("epv", columns, filters)
+
+def load_salary_ranks(season: int = None, league_id: int = None) -> pl.DataFrame:
+    """
+    Lädt die Gehälter mit ihrem Rang pro Liga, Saison und Position (aus der materialisierten Sicht 'mv_salary_ranks').
+    """
+    filters = [Filter("season", "==", season)] if season is not None else []
+    if league_id is not None:
+        filters.append(Filter("league_id", "==", league_id))
+    return _query_table("mv_salary_ranks", columns=["season", "pos", "rank", "salary"], filters=filters)
+
+def filter_table(team: str, season: int, league_id: int = None) -> pl.DataFrame:
+    """
+    Filtert die Vertragsdaten basierend auf Team, Saison und (optional) Liga.
+    """
+    filters = [
+        Filter("franchise_name", "==", team),
+        Filter("season", "==", season),
+        Filter("contract_years", "<=", 1),
+    ]
+    if league_id is not None:
+        filters.append(Filter("league_id", "==", league_id))
+    contracts_df = load_contracts(
+        columns=["season", "conference", "franchise_name", "player_id", "player_name", "pos", "salary", "contract_years"],
+        filters=filters,
     )
+    return contracts_df.sort(by=pl.col("pos"))
 
-    return contracts_df
+def _league_filter(league_id: int = None) -> list:
+    return [Filter("league_id", "==", league_id)] if league_id is not None else None
 
-def get_unique_teams() -> list:
+def get_unique_teams(league_id: int = None) -> list:
     """
-    Gibt eine Liste der einzigartigen Teams zurück.
+    Gibt eine Liste der einzigartigen Teams (optional einer Liga) zurück (aus der materialisierten Sicht 'mv_teams').
+    Die Sicht wird für alle Ligen gemeinsam gecacht; ein Ligawechsel filtert nur lokal.
     """
-    contracts_df = load_contracts() 
-    contracts_df = contracts_df.with_columns(pl.col("franchise_name").fill_null("Free Agent"))
-    # Duplikate basierend auf 'franchise_name' entfernen und nach 'division' sortieren
-    unique_contracts_df = contracts_df.unique(subset=["franchise_name"]).sort("division")
+    teams_df = apply_query(
+        get_snapshot("mv_teams", lambda: _load_table("mv_teams")), filters=_league_filter(league_id)
+    ).sort("division")
 
     # Teams-Liste erstellen
     teams = [
         (row["franchise_name"], Icon(row["logo"], row["franchise_name"]))
-        for row in unique_contracts_df.iter_rows(named=True)
+        for row in teams_df.iter_rows(named=True)
     ]
 
     return teams
 
-def get_seasons() -> list:
+def get_seasons(league_id: int = None) -> list:
     """
-    Gibt eine Liste der verfügbaren Saisons zurück.
+    Gibt eine Liste der verfügbaren Saisons (optional einer Liga) zurück (aus der materialisierten Sicht 'mv_seasons').
     """
-    contracts_df = load_contracts() 
-    seasons = contracts_df.select("season").unique().to_series().to_list()
-    seasons = [int(season) for season in seasons]
+    seasons_df = apply_query(
+        get_snapshot("mv_seasons", lambda: _load_table("mv_seasons")), filters=_league_filter(league_id)
+    )
+    seasons = {int(season) for season in seasons_df.get_column("season").to_list()}
     return sorted(seasons, reverse=True)
 
+def league_contracts(league_id: int) -> PagedTable:
+    """
+    Gibt alle Verträge einer Liga über alle Saisons als serverseitig geblätterte Tabelle zurück.
+    Sortierung, Filter und Seitenabfragen laufen als Abfrage gegen die Tabelle 'contracts'
+    (Indizes mit führender league_id); es wird nie die ganze Liga geladen.
+    """
+    return PagedTable(
+        table="contracts",
+        columns=["season", "franchise_name", "player_id", "player_name", "pos", "salary", "contract_years", "conference"],
+        filters=[Filter("league_id", "==", league_id)],
+    )
+
 def get_weeks() -> list:
     """
     Gibt eine Liste der Wochen zurück.
@@ -1,34 +1,98 @@
-import os
+import io
 import logging
-import pandas as pd
 import polars as pl
 import psycopg2
-import rpy2.robjects as ro
-from rpy2.robjects import pandas2ri
-import rpy2.rinterface_lib as rinterface_lib
-from datetime import datetime
-import numpy as np
-from services.ffscrapr import *
-from config.config import db_config
-
-def create_connection():
-    """Verbindet sich mit der PostgreSQL-Datenbank anhand der Konfiguration in db_config."""
-    return psycopg2.connect(
-        host=db_config["host"],
-        port=db_config["port"],
-        dbname=db_config["dbname"],
-        user=db_config["user"],
-        password=db_config["password"]
-    )
+from psycopg2 import sql
+from services.query import build_page_select, build_select
+from services.connection_pool import get_connection
+from services.metrics import span
+from config.config import DB_READ_METHOD
+
+# Lesepfad der Datenbank. Der Abruf- und Schreibpfad (Scraping, Verträge) liegt in services/ingestion.py,
+# damit die Web-App beim Start weder rpy2 noch R lädt.
+
+# PostgreSQL-Typ-OIDs -> Polars-Datentypen für den COPY-Lesepfad
+PG_TYPE_MAP = {
+    16: pl.Boolean,     # bool
+    20: pl.Int64,       # int8
+    21: pl.Int16,       # int2
+    23: pl.Int32,       # int4
+    700: pl.Float32,    # float4
+    701: pl.Float64,    # float8
+    1700: pl.Float64,   # numeric
+    25: pl.Utf8,        # text
+    1042: pl.Utf8,      # bpchar
+    1043: pl.Utf8,      # varchar
+    1082: pl.Date,      # date
+    1114: pl.Datetime,  # timestamp
+}
+
+def _read_via_fetch(cursor, query, params) -> pl.DataFrame:
+    """
+    Liest das Abfrageergebnis über cursor.fetchall() als Python-Tupel ein (ursprünglicher Lesepfad).
+    """
+    with span("db.query"):
+        cursor.execute(query, params)
+    with span("db.fetch") as s:
+        rows = cursor.fetchall()
+        s.rows = len(rows)
+    columns = [desc[0] for desc in cursor.description]
+    with span("db.frame_build") as s:
+        df = pl.DataFrame(rows, schema=columns)
+        s.rows = df.height
+    return df
+
+def _read_via_copy(cursor, query, params) -> pl.DataFrame:
+    """
+    Streamt das Abfrageergebnis per COPY ... TO STDOUT als CSV und liest es spaltenweise mit Polars ein.
+    Die Datentypen werden aus den Postgres-Typen der Abfrage übernommen.
+    """
+    # Schema der Abfrage ohne Datenübertragung bestimmen
+    with span("db.query"):
+        cursor.execute(sql.SQL("SELECT * FROM ({}) AS q LIMIT 0").format(query), params)
+    pg_types = {desc.name: desc.type_code for desc in cursor.description}
+    dtypes = {name: PG_TYPE_MAP.get(oid, pl.Utf8) for name, oid in pg_types.items()}
+
+    copy_query = sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER true)").format(query)
+    buffer = io.BytesIO()
+    with span("db.fetch") as s:
+        cursor.copy_expert(cursor.mogrify(copy_query, params).decode(), buffer)
+        s.bytes = buffer.tell()
+    buffer.seek(0)
+
+    # Bool-, Datums- und Zeitstempelspalten werden als Text gelesen und anschließend konvertiert
+    text_columns = [name for name, dtype in dtypes.items() if dtype in (pl.Boolean, pl.Date, pl.Datetime)]
+    with span("db.frame_build") as s:
+        df = pl.read_csv(
+            buffer,
+            dtypes={name: (pl.Utf8 if name in text_columns else dtype) for name, dtype in dtypes.items()},
+        )
+        conversions = []
+        for name in text_columns:
+            if dtypes[name] == pl.Boolean:
+                conversions.append((pl.col(name) == "t").alias(name))
+            elif dtypes[name] == pl.Date:
+                conversions.append(pl.col(name).str.to_date("%Y-%m-%d"))
+            else:
+                conversions.append(pl.col(name).str.to_datetime())
+        if conversions:
+            df = df.with_columns(conversions)
+        s.rows = df.height
+    return df
 
-def load_table_from_db(table: str, db_config: dict) -> pl.DataFrame:
+def load_table_from_db(table: str, conn=None, columns: list = None, filters: list = None, method: str = None) -> pl.DataFrame:
     """
     Lädt die angegebene Tabelle aus einer PostgreSQL-Datenbank und konvertiert sie in ein Polars DataFrame.
+    Spaltenauswahl und Filter werden als parametrisierte Abfrage an die Datenbank übergeben.
     
     Parameters:
     table (str): Der Name der Tabelle in der PostgreSQL-Datenbank.
-    db_config (dict): Konfigurationsdaten für die PostgreSQL-Datenbank.
-                      Beispiel: {"host": "localhost", "port": 5432, "dbname": "taipy_db", "user": "user", "password": "password"}
+    conn: Offene psycopg2-Verbindung, die wiederverwendet und nicht geschlossen wird.
+          Ohne Verbindung wird eine aus dem Pool ausgeliehen.
+    columns (list): Die zu ladenden Spalten. None lädt alle Spalten.
+    filters (list): Liste von services.query.Filter, z.B. [Filter("season", "==", 2024)].
+    method (str): "copy" (spaltenweise über COPY) oder "fetch" (zeilenweise über fetchall).
+                  Standard ist DB_READ_METHOD aus der Konfiguration.
     
     Returns:
     pl.DataFrame: Polars DataFrame mit den Daten aus der angegebenen Tabelle.
@@ -39,26 +103,24 @@ def load_table_from_db(table: str, db_config: dict) -> pl.DataFrame:
     """
     if not table:
         raise ValueError("Tabellenname muss angegeben werden.")
-    
-    # Verbindung zur DB herstellen
-    conn = db_config
+    method = method or DB_READ_METHOD
+    if method not in ("copy", "fetch"):
+        raise ValueError(f"Unbekannte Lesemethode: '{method}'")
+
+    if conn is None:
+        with get_connection() as pooled_conn:
+            return load_table_from_db(table, pooled_conn, columns, filters, method)
     
     try:
         # SQL-Abfrage erstellen
-        query = f"SELECT * FROM {table}"
-        
-        # Cursor erstellen und SQL-Abfrage ausführen
-        cursor = conn.cursor()
-        cursor.execute(query)
-        
-        # Alle Zeilen abholen
-        rows = cursor.fetchall()
+        query, params = build_select(table, columns, filters)
         
-        # Spaltennamen extrahieren
-        columns = [desc[0] for desc in cursor.description]
-        
-        # Einen Polars DataFrame aus den Ergebnissen erstellen
-        contracts_df = pl.DataFrame(rows, schema=columns)
+        # Cursor erstellen, SQL-Abfrage ausführen und Polars DataFrame erstellen
+        with conn.cursor() as cursor:
+            if method == "copy":
+                contracts_df = _read_via_copy(cursor, query, params)
+            else:
+                contracts_df = _read_via_fetch(cursor, query, params)
         
         if contracts_df.height == 0:
             logging.warning(f"Die Tabelle '{table}' ist leer.")
@@ -70,21 +132,34 @@ def load_table_from_db(table: str, db_config: dict) -> pl.DataFrame:
     except psycopg2.Error as e:
         logging.error(f"Fehler bei der Datenbankabfrage für Tabelle '{table}': {e}")
         raise psycopg2.Error(f"Fehler bei der Datenbankabfrage: {e}")
-    
-    finally:
-        # Verbindung und Cursor schließen
-        if conn:
-            conn.close()
-            logging.info("Datenbankverbindung geschlossen.")
 
-def delete_table_from_db(table_name: str, db_config: dict) -> None:
+def load_page_from_db(table: str, columns: list = None, filters: list = None, order_by: str = None,
+                      descending: bool = False, limit: int = None, offset: int = 0, method: str = None) -> tuple[pl.DataFrame, int]:
+    """
+    Lädt eine sortierte und gefilterte Seite einer Tabelle sowie die Gesamtzahl der gefilterten Zeilen.
+    Sortierung, Filter und LIMIT/OFFSET werden in der Datenbank ausgeführt.
+
+    Returns:
+    tuple: (Polars DataFrame der Seite, Anzahl aller gefilterten Zeilen)
+
+    Raises:
+    psycopg2.Error: Wenn es ein Problem beim Ausführen der Abfrage gibt.
+    """
+    method = method or DB_READ_METHOD
+    query, count_query, params = build_page_select(table, columns, filters, order_by, descending, limit, offset)
+    with get_connection() as conn, conn.cursor() as cursor:
+        with span("db.query"):
+            cursor.execute(count_query, params)
+            total = cursor.fetchone()[0]
+        page_df = _read_via_copy(cursor, query, params) if method == "copy" else _read_via_fetch(cursor, query, params)
+    return page_df, total
+
+def delete_table_from_db(table_name: str) -> None:
     """
     Deletes the specified table from the PostgreSQL database.
     
     Parameters:
     table_name (str): The name of the table to be deleted.
-    db_config (dict): Configuration for the PostgreSQL database.
-                      Example: {"host": "localhost", "port": 5432, "dbname": "taipy_db", "user": "user", "password": "password"}
     
     Returns:
     None
@@ -92,308 +167,26 @@ def delete_table_from_db(table_name: str, db_config: dict) -> None:
     Raises:
     psycopg2.Error: If there is an issue connecting to the database or executing the query.
     """
-    conn_db = None
     try:
-        # Verbindung zur PostgreSQL-Datenbank herstellen
-        conn_db = create_connection()
-        cursor = conn_db.cursor()
-        logging.info(f"Connected to PostgreSQL database at {db_config['host']}")
+        with get_connection() as conn_db, conn_db.cursor() as cursor:
+            # Überprüfen, ob die Tabelle existiert
+            cursor.execute("""
+                SELECT EXISTS (
+                    SELECT FROM pg_tables
+                    WHERE schemaname = 'public' AND tablename = %s
+                );
+            """, (table_name,))
+            table_exists = cursor.fetchone()[0]
 
-        # Überprüfen, ob die Tabelle existiert
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM pg_tables
-                WHERE schemaname = 'public' AND tablename = %s
-            );
-        """, (table_name,))
-        table_exists = cursor.fetchone()[0]
-
-        if not table_exists:
-            logging.warning(f"Table '{table_name}' does not exist in the database.")
-            return
+            if not table_exists:
+                logging.warning(f"Table '{table_name}' does not exist in the database.")
+                return
 
-        # SQL-Befehl zum Löschen der Tabelle
-        query = f"DROP TABLE IF EXISTS {table_name}"
-        cursor.execute(query)
-        conn_db.commit()
-        logging.info(f"Table '{table_name}' has been deleted from the database.")
+            # SQL-Befehl zum Löschen der Tabelle
+            cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table_name)))
+            conn_db.commit()
+            logging.info(f"Table '{table_name}' has been deleted from the database.")
 
     except psycopg2.Error as e:
         logging.error(f"Database error while deleting table '{table_name}': {e}")
         raise psycopg2.Error(f"Database error: {e}")
-    
-    finally:
-        # Verbindung zur PostgreSQL-Datenbank schließen
-        if conn_db:
-            cursor.close()
-            conn_db.close()
-            logging.info("Database connection closed.")
-
-def calculate_and_save_contracts(start_year: int, end_year: int, db_config: dict):
-    """
-    Save contracts data for multiple years to a PostgreSQL database.
-    
-    Parameters:
-    start_year (int): The starting year for processing contracts data.
-    end_year (int): The ending year for processing contracts data.
-    db_config (dict): Configuration for the PostgreSQL database.
-                      Example: {"host": "localhost", "port": 5432, "dbname": "taipy_db", "user": "user", "password": "password"}
-    
-    Returns:
-    None
-    """
-    try:
-        conn_db = create_connection()
-        cursor = conn_db.cursor()
-
-        # Überprüfen, ob die Tabelle existiert
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM pg_tables
-                WHERE schemaname = 'public' AND tablename = 'contracts'
-            );
-        """)
-        table_exists = cursor.fetchone()[0]
-
-        for year in range(start_year, end_year + 1):
-            if table_exists:
-                cursor.execute("SELECT COUNT(*) FROM contracts WHERE season = %s", (year,))
-                result = cursor.fetchone()
-                if result[0] > 0:
-                    logging.info(f"Contracts for year {year} already present in database. Skipping.")
-                    continue
-
-            # Process contracts data for the year
-            contracts = (
-                load_table_from_db("playerscores", db_config)
-                .group_by(["player_id", "season"])
-                .agg(
-                    player_name=pl.col("player_name").first(),
-                    pos=pl.col("pos").first(),
-                    team=pl.col("team").first(),
-                    num_games=pl.col("points").count(),
-                    tot_pts=pl.col("points").sum(),
-                    avg_pts=pl.col("points").mean()
-                )
-                .with_columns(is_robust=pl.col("num_games") >= 5)
-            )
-
-            contracts = (
-                contracts
-                .with_columns(
-                    tot_pts_rank=pl.struct("tot_pts").rank("max", descending=True).over(["pos", "season"]),
-                    avg_pts_rank=pl.struct("avg_pts").rank("max", descending=True).over(["pos", "season"])
-                )
-                .join(calculate_floor_pts_rank(), on="pos")
-            )
-
-            contracts = (
-                contracts
-                .join(load_table_from_db("roster", db_config), on=["player_id", "season"], how="left")
-                .drop([col for col in contracts.columns if col.endswith("_right")])
-                .join(
-                    load_table_from_db("franchises", db_config).select(
-                        ["franchise_id", "season", "salaryCapAmount", "conference", "division", "logo"]
-                    ),
-                    on=["franchise_id", "season"],
-                    how="left"
-                )
-                .drop([col for col in contracts.columns if col.endswith("_right")])
-                .with_columns(
-                    salary_rank=pl.struct("salary").rank("ordinal", descending=True).over(["pos", "season", "conference"])
-                )
-            )
-
-            # Save the contracts data to the database
-            contracts_pandas = contracts.to_pandas()
-            if not table_exists:
-                contracts_pandas.to_sql("contracts", conn_db, if_exists="replace", index=False, method='multi')
-                table_exists = True
-            else:
-                contracts_pandas.to_sql("contracts", conn_db, if_exists="append", index=False, method='multi')
-            logging.info(f"Contracts data for year {year} written to PostgreSQL database.")
-
-        conn_db.commit()
-        cursor.close()
-        conn_db.close()
-    except Exception as e:
-        logging.error(f"Error in calculate_and_save_contracts: {e}")
-        raise
-
-def load_franchises(start_year: int, end_year: int, league_id: int, db_config: dict):
-    """
-    Save franchise data for multiple years to a PostgreSQL database.
-    
-    Parameters:
-    start_year (int): The starting year for processing data.
-    end_year (int): The ending year for processing data.
-    league_id (int): The league ID for connecting to the data source.
-    db_config (dict): Configuration for the PostgreSQL database.
-                      Example: {"host": "localhost", "port": 5432, "dbname": "taipy_db", "user": "user", "password": "password"}
-    
-    Returns:
-    None
-    """
-    try:
-        conn_db = create_connection()
-        cursor = conn_db.cursor()
-
-        # Überprüfen, ob die Tabelle existiert
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM pg_tables
-                WHERE schemaname = 'public' AND tablename = 'franchises'
-            );
-        """)
-        table_exists = cursor.fetchone()[0]
-
-        for year in range(start_year, end_year + 1):
-            if table_exists:
-                cursor.execute("SELECT COUNT(*) FROM franchises WHERE season = %s", (year,))
-                result = cursor.fetchone()
-                if result[0] > 0:
-                    logging.info(f"Franchises for year {year} already present in database. Skipping.")
-                    continue
-
-            # Process and save franchise data
-            conn = ff_connect(year, league_id)
-            franchise_df = ffscrapr.ff_franchises(conn)
-            franchise_df = pandas2ri.rpy2py(franchise_df)
-            franchise_df = franchise_df.map(lambda x: np.nan if isinstance(x, rinterface_lib.sexp.NACharacterType) else x)
-            franchise_df = pl.from_pandas(franchise_df)
-            franchise_df = franchise_df.with_columns(
-                season=pl.lit(year),
-                timestamp=pl.lit(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-            )
-
-            franchise_pandas = franchise_df.to_pandas()
-            if not table_exists:
-                franchise_pandas.to_sql("franchises", conn_db, if_exists="replace", index=False, method='multi')
-                table_exists = True
-            else:
-                franchise_pandas.to_sql("franchises", conn_db, if_exists="append", index=False, method='multi')
-            logging.info(f"Franchise data for year {year} written to PostgreSQL database.")
-
-        conn_db.commit()
-        cursor.close()
-        conn_db.close()
-    except Exception as e:
-        logging.error(f"Error in load_franchises: {e}")
-        raise
-
-def load_rosters(start_year: int, end_year: int, league_id: int, db_config: dict):
-    """
-    Save roster data for multiple years to a PostgreSQL database.
-    
-    Parameters:
-    start_year (int): The starting year for processing roster data.
-    end_year (int): The ending year for processing roster data.
-    league_id (int): The league ID for connecting to the data source.
-    db_config (dict): Configuration for the PostgreSQL database.
-                      Example: {"host": "localhost", "port": 5432, "dbname": "taipy_db", "user": "user", "password": "password"}
-    
-    Returns:
-    None
-    """
-    try:
-        # Verbindung zur PostgreSQL-Datenbank herstellen
-        conn_db = create_connection()
-        cursor = conn_db.cursor()
-
-        # Überprüfen, ob die Tabelle existiert
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM pg_tables
-                WHERE schemaname = 'public' AND tablename = 'roster'
-            );
-        """)
-        table_exists = cursor.fetchone()[0]
-
-        for year in range(start_year, end_year + 1):
-            if table_exists:
-                cursor.execute(sql.SQL("SELECT COUNT(*) FROM roster WHERE season = %s"), (year,))
-                result = cursor.fetchone()
-                if result[0] > 0:
-                    logging.info(f"Roster for year {year} already present in database. Skipping.")
-                    continue
-
-            # Process roster data for the year
-            conn = ff_connect(year, league_id)
-            roster_df = ffscrapr.ff_rosters(conn)
-            roster_df = pandas2ri.rpy2py(roster_df)
-            roster_df = roster_df.map(lambda x: np.nan if isinstance(x, rinterface_lib.sexp.NACharacterType) else x)
-            roster_df = pl.from_pandas(roster_df)
-            roster_df = (
-                roster_df
-                .with_columns(
-                    player_id=pl.col("player_id").cast(pl.Int32),
-                    season=pl.lit(year),
-                    timestamp=pl.lit(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-                )
-            )
-
-            # Save the roster data to the database
-            roster_df_pandas = roster_df.to_pandas()
-            if not table_exists:
-                roster_df_pandas.to_sql("roster", conn_db, if_exists="replace", index=False, method='multi')
-                table_exists = True
-            else:
-                roster_df_pandas.to_sql("roster", conn_db, if_exists="append", index=False, method='multi')
-            logging.info(f"Roster data for year {year} written to PostgreSQL database.")
-
-        conn_db.commit()
-        cursor.close()
-        conn_db.close()
-    except Exception as e:
-        logging.error(f"Error in load_rosters: {e}")
-        raise
-
-def load_playerscores(mfl_id: int = 60206, past_seasons: list = [2024, 2023, 2022, 2021, 2020], max_week: int = 17, save_label: str = 'MFL'):
-    """
-    Load or scrape player scores data.
-    
-    Parameters:
-    mfl_id (int): The MFL league ID.
-    past_seasons (list): List of seasons to process.
-    max_week (int): Maximum week number to consider.
-    save_label (str): Label for saving the CSV file.
-    
-    Returns:
-    pd.DataFrame: DataFrame containing player scores data.
-    """
-    try:
-        load_data = True
-        if load_data and os.path.isfile(f'{save_label}_PlayerScores.csv'):
-            logging.info('Loading playerscore data from disk')
-            playerscores_df = pd.read_csv(f'{save_label}_PlayerScores.csv')
-            return playerscores_df
-
-        logging.info('Scraping roster and playerscore data from MFL')
-        playerscores_df = {}
-
-        for season in past_seasons:
-            mfl = ffscrapr.mfl_connect(season=season, league_id=mfl_id, rate_limit_number=1, rate_limit_seconds=6)
-            playerscores_df_r = ffscrapr.ff_playerscores(mfl, season=season, week=[i + 1 for i in range(max_week)])
-
-            with (ro.default_converter + pandas2ri.converter).context():
-                playerscores_df[season] = ro.conversion.get_conversion().rpy2py(playerscores_df_r)
-
-            # Cleanup data
-            playerscores_df[season]['season'] = playerscores_df[season]['season'].astype(int)
-            playerscores_df[season]['week'] = playerscores_df[season]['week'].astype(int)
-            playerscores_df[season]['player_id'] = playerscores_df[season]['player_id'].astype(int)
-            playerscores_df[season]['points'] = playerscores_df[season]['points'].astype(float)
-            playerscores_df[season] = playerscores_df[season].drop('is_available', axis=1)
-
-        # Merge seasons into a single DataFrame
-        playerscores_df = pd.concat(playerscores_df, ignore_index=True)
-        playerscores_df = playerscores_df.set_index(['player_id', 'season', 'week']).sort_index(level=[0, 1, 2], ascending=[True, True, True]).reset_index()
-
-        # Save to CSV
-        playerscores_df.to_csv(f'{save_label}_PlayerScores.csv', index=False)
-        logging.info(f"Player scores data saved to {save_label}_PlayerScores.csv")
-
-        return playerscores_df
-    except Exception as e:
-        logging.error(f"Error in load_playerscores: {e}")
-        raise
@@ -0,0 +1,101 @@
+# edit_overlay.py
+
+import threading
+import time
+import polars as pl
+from config.config import EDIT_SESSION_TTL_SECONDS
+
+# Bearbeitungen in der Vertragstabelle werden pro Session als dünn besetzte Deltas
+# (season, player_id, Spalte) -> Wert gespeichert, statt bei jeder Änderung den ganzen DataFrame zu kopieren.
+# season und player_id bilden den Zeilenschlüssel eines Vertrags innerhalb einer Liga; beim Ligawechsel
+# werden die Bearbeitungen verworfen. Die Deltas werden erst angewendet, wenn ein Frame gelesen wird
+# (z.B. in calculate_epvs).
+# Taipy meldet das Ende einer Session nicht; die Bearbeitungen einer Session werden daher verworfen, wenn sie
+# länger als EDIT_SESSION_TTL_SECONDS nicht benutzt wurden.
+
+# Zeilenschlüssel, über den die Deltas mit dem Frame verbunden werden
+KEY_COLUMNS = ["season", "player_id"]
+
+_overlays: dict = {}
+_last_used: dict = {}
+_lock = threading.Lock()
+
+def cast_value(value, dtype: pl.DataType):
+    """
+    Wandelt einen bearbeiteten Wert in den Spaltentyp um.
+
+    Raises:
+    ValueError: Wenn sich der Wert nicht in den Spaltentyp umwandeln lässt.
+    """
+    cast = pl.Series([value]).cast(dtype, strict=False)[0]
+    if cast is None and value is not None:
+        raise ValueError(f"'{value}' lässt sich nicht in {dtype} umwandeln.")
+    return cast
+
+def _prune(now: float) -> None:
+    # Erwartet gehaltenes _lock
+    for session_id in [session_id for session_id, used in _last_used.items() if now - used > EDIT_SESSION_TTL_SECONDS]:
+        _overlays.pop(session_id, None)
+        _last_used.pop(session_id, None)
+
+def record_edit(session_id: str, season: int, player_id: int, column: str, value) -> None:
+    """
+    Speichert eine Bearbeitung. Eine erneute Bearbeitung derselben Zelle überschreibt den Wert.
+    Der Wert sollte bereits mit cast_value geprüft sein; apply_overlay wandelt ihn in den Spaltentyp um.
+    """
+    now = time.monotonic()
+    with _lock:
+        _prune(now)
+        _overlays.setdefault(session_id, {})[(season, player_id, column)] = value
+        _last_used[session_id] = now
+
+def get_edits(session_id: str) -> dict:
+    """
+    Gibt die Bearbeitungen einer Session als {(season, player_id, Spalte): Wert} zurück.
+    """
+    with _lock:
+        if session_id in _overlays:
+            _last_used[session_id] = time.monotonic()
+        return dict(_overlays.get(session_id, {}))
+
+def clear_edits(session_id: str) -> None:
+    with _lock:
+        _overlays.pop(session_id, None)
+        _last_used.pop(session_id, None)
+
+def apply_overlay(df: pl.DataFrame, session_id: str) -> pl.DataFrame:
+    """
+    Wendet die Bearbeitungen einer Session auf einen Frame mit den Spalten season und player_id an.
+    Bearbeitungen für Zeilen oder Spalten, die nicht im Frame enthalten sind, werden ignoriert.
+    Werte, die sich nicht in den Spaltentyp umwandeln lassen, lassen den Wert unverändert; die GUI weist
+    solche Bearbeitungen bereits vor record_edit zurück.
+
+    Parameters:
+    df (pl.DataFrame): Der zu überlagernde Frame.
+    session_id (str): Die Session, deren Bearbeitungen angewendet werden.
+
+    Returns:
+    pl.DataFrame: Der Frame mit den bearbeiteten Werten.
+    """
+    by_column = {}
+    for (season, player_id, column), value in get_edits(session_id).items():
+        if column in df.columns:
+            by_column.setdefault(column, ([], [], []))
+            by_column[column][0].append(season)
+            by_column[column][1].append(player_id)
+            by_column[column][2].append(value)
+
+    for column, (seasons, player_ids, values) in by_column.items():
+        dtype = df.schema[column]
+        # Jeden Wert einzeln und nicht strikt umwandeln; nicht umwandelbare Werte werden zu null
+        edited = [pl.Series([value]).cast(dtype, strict=False)[0] for value in values]
+        delta = pl.DataFrame(
+            {"season": seasons, "player_id": player_ids, "_edited": edited},
+            schema={"season": df.schema["season"], "player_id": df.schema["player_id"], "_edited": dtype},
+        )
+        df = (
+            df.join(delta, on=KEY_COLUMNS, how="left")
+            .with_columns(pl.coalesce("_edited", column).alias(column))
+            .drop("_edited")
+        )
+    return df
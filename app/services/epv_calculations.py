@@ -1,65 +1,178 @@
 # epv_calculations.py
 
+import logging
 import polars as pl
-from taipy.gui import navigate, notify
-from services.data_processing import load_contracts, load_salaries
+import psycopg2
+from taipy.gui import get_state_id, invoke_long_callback, navigate, notify
+from services.data_processing import load_contracts, load_salary_ranks, load_epv_table
+from services.database_service import load_table_from_db
+from services.bulk_writer import write_frame
+from services.connection_pool import get_connection
+from services.query import Filter
+from services.snapshot_cache import get_snapshot
+from services.edit_overlay import apply_overlay
+from services.metrics import span
+from services.schema import ensure_indexes
+from services.paged_table import PagedTable
+from services.background_jobs import (
+    JobCancelled, cancel_job, create_job, finish_job, is_cancelled, next_stage_report, run_job, set_stage
+)
+from config.config import BACKGROUND_STATUS_PERIOD_MS, EPV_EXPLAIN, EPV_MAX_EXTENSION_YEARS, LEAGUE_ID
 
-def calculate_new_salary(df: pl.DataFrame) -> pl.DataFrame:
+def _geometric_sum(growth_rate: pl.Expr, n: pl.Expr) -> pl.Expr:
+    """
+    Summe von growth_rate ** i für i in range(n) in geschlossener Form: (g^n - 1) / (g - 1), bzw. n für g == 1.
+    """
+    n = n.clip(lower_bound=0)
+    return (
+        pl.when(growth_rate == 1.0)
+        .then(n.cast(pl.Float64))
+        .otherwise((growth_rate.pow(n) - 1.0) / (growth_rate - 1.0))
+    )
+
+def calculate_new_salary(df: pl.DataFrame | pl.LazyFrame, growth_rate: float = 1.1) -> pl.DataFrame | pl.LazyFrame:
     """
     Berechnet das geglättete Gehalt für einen DataFrame.
+
+    Die bisherigen Jahre werden mit `salary`, die Verlängerungsjahre mit `eys` gewichtet, jeweils mit
+    jährlich um `growth_rate` wachsendem Gewicht. Enthält der DataFrame bereits eine Spalte `growth_rate`,
+    wird sie pro Zeile verwendet.
     """
-    def calculate_smoothed_salary(row):
-        total_first = sum(row["salary"] * (row["growth_rate"] ** i) for i in range(int(row["prev_yrs"])))
-        total_second = sum(row["eys"] * (row["growth_rate"] ** i) for i in range(int(row["prev_yrs"]), int(row["prev_yrs"] + row["ext_yrs"])))
-        combined_total = total_first + total_second
-        total_years = row["prev_yrs"] + row["ext_yrs"]
-        denominator = sum(row["growth_rate"] ** i for i in range(int(total_years)))
-        return combined_total / denominator
+    if "growth_rate" not in df.columns:
+        df = df.with_columns(growth_rate=pl.lit(growth_rate))
+
+    g = pl.col("growth_rate")
+    prev_years = pl.col("prev_yrs").cast(pl.Int64)
+    total_years = (pl.col("prev_yrs") + pl.col("ext_yrs")).cast(pl.Int64)
+    sum_prev = _geometric_sum(g, prev_years)
+    sum_total = _geometric_sum(g, total_years)
 
     df = (
         df
-        .with_columns(growth_rate=pl.lit(1.1))
         .with_columns(
-            new_sal=pl.struct(["salary", "growth_rate", "prev_yrs", "ext_yrs", "eys"])
-            .apply(calculate_smoothed_salary)
+            new_sal=(pl.col("salary") * sum_prev + pl.col("eys") * (sum_total - sum_prev)) / sum_total
         )
         .with_columns(new_sal=pl.col("new_sal").round(2))
     )
     return df
 
-def calculate_epvs(state):
+def extrapolate_top_salaries(salaries: pl.DataFrame, n_ranks: int = 2) -> pl.DataFrame:
     """
-    Aktualisiert den DataFrame basierend auf den angegebenen Filterkriterien und speichert ihn in `state.filtered_df`.
+    Extrapoliert pro Position Gehälter oberhalb des Spitzengehalts als Ränge 0, -1, ..., -(n_ranks - 1).
 
-    :param state: Der aktuelle State der Taipy-Anwendung.
+    Aus den vier höchsten Gehältern s1 >= s2 >= s3 >= s4 ergibt sich die Schrittweite
+    d = (2 * s2 - s3 - s4) / 3. Rang 0 erhält s1 + d, Rang -1 erhält s1 + 2d (= 2 * Rang 0 - s1) usw.
+    Positionen mit weniger als vier Gehältern werden übersprungen.
+
+    Parameters:
+    salaries (pl.DataFrame): Gehaltstabelle mit den Spalten pos und salary.
+    n_ranks (int): Anzahl der zu extrapolierenden Ränge.
+
+    Returns:
+    pl.DataFrame: Tabelle mit den Spalten pos, rank und salary.
     """
+    ranks = pl.DataFrame({"rank": list(range(0, -n_ranks, -1))}, schema={"rank": pl.Int32})
+    return (
+        salaries
+        .group_by("pos", maintain_order=True)
+        .agg(top=pl.col("salary").sort(descending=True).head(4))
+        .filter(pl.col("top").list.len() >= 4)
+        .with_columns(
+            max_salary=pl.col("top").list.get(0),
+            step=(2 * pl.col("top").list.get(1) - pl.col("top").list.get(2) - pl.col("top").list.get(3)) / 3,
+        )
+        .join(ranks, how="cross")
+        .with_columns(salary=pl.col("max_salary") + (1 - pl.col("rank")) * pl.col("step"))
+        .select(["pos", "rank", "salary"])
+    )
 
-    # Filtere Spieler und Teams basierend auf den Vertragsjahren
-    player_filter = (
-        pl.from_pandas(state.filtered_df)
-        .filter(pl.col("contract_years") > 1)
-        .select("player_id")
-        .to_series()
-        .to_list()
+def build_salary_table(season: int, n_ranks: int = 2, league_id: int = None) -> pl.DataFrame:
+    """
+    Lädt die Gehälter einer Saison (optional einer Liga) mit ihren Rängen pro Position und ergänzt die
+    extrapolierten Sonderränge.
+    """
+    salaries = load_salary_ranks(season, league_id)
+    if league_id is None:
+        # Die Sicht vergibt die Ränge pro Liga; über alle Ligen wird neu gerankt
+        salaries = salaries.with_columns(rank=pl.col("salary").rank(method="ordinal", descending=True).over("pos"))
+    salaries = (
+        salaries
+        .with_columns(rank=pl.col("rank").cast(pl.Int32))
+        .sort("pos", "rank", descending=[False, False])
+        .select(["pos", "rank", "salary"])
     )
-    team_filter = (
-        pl.from_pandas(state.filtered_df)
-        .filter(pl.col("contract_years") > 1)
-        .select("conference")
-        .to_series()
-        .to_list()
+    return pl.concat([salaries, extrapolate_top_salaries(salaries, n_ranks)], how="vertical_relaxed")
+
+def get_salary_bands(season: int, n_ranks: int = 2, league_id: int = None) -> pl.DataFrame:
+    """
+    Gibt die Gehaltsbänder einer Saison zurück. Sie werden pro Saison und Liga im Snapshot-Cache gehalten.
+    """
+    def load():
+        with span("epv.salary_bands") as s:
+            bands = build_salary_bands(build_salary_table(season, n_ranks, league_id))
+            s.rows = bands.height
+        return bands
+
+    return get_snapshot(f"salary_bands:{league_id}:{season}:{n_ranks}", load)
+
+def build_salary_bands(salaries: pl.DataFrame) -> pl.DataFrame:
+    """
+    Fasst die Gehaltstabelle (pos, rank, salary) zu Gehaltsbändern zusammen.
+
+    Das Band `rank_pair` r einer Position ist der Mittelwert der Gehälter mit Rang 2r-3 und 2r-2.
+    Die Sonderränge 0 und -1 fallen damit in das Band r = 1.
+    """
+    return (
+        salaries
+        .with_columns(rank_pair=((pl.col("rank").cast(pl.Int32) + 3) // 2))
+        .group_by(["pos", "rank_pair"])
+        .agg(band_salary=pl.col("salary").mean())
     )
 
-    # Erster Transformationsschritt
-    filtered_contracts_df = (
-        load_contracts()
-        .with_columns(YO5 = pl.when(pl.col("contractInfo").str.contains("5YO")).then(pl.lit(1)).otherwise(pl.lit(0)))
-        .filter(
-            (pl.col("player_id").is_in(player_filter))
-            & ((pl.col("conference").is_in(team_filter)) | pl.col("conference").is_null())
-            & (pl.col("season")<=state.selected_season)
+def join_salary_bands(df: pl.DataFrame | pl.LazyFrame, bands: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Ergänzt `salary1` bis `salary3` über die Ränge `pr1` bis `pr3` aus den Gehaltsbändern.
+
+    In Woche 0 (bzw. ohne Spalte `week`) werden die Gehälter mit 1.1 multipliziert.
+    """
+    if "week" in df.columns:
+        multiplier = pl.when(pl.col("week").fill_null(0) == 0).then(pl.lit(1.1)).otherwise(pl.lit(1.0))
+    else:
+        multiplier = pl.lit(1.1)
+
+    for i, rank_column in enumerate(["pr1", "pr2", "pr3"], start=1):
+        df = (
+            df
+            .with_columns(rank_pair=pl.col(rank_column).cast(pl.Int32))
+            .join(bands.rename({"band_salary": f"salary{i}"}), on=["pos", "rank_pair"], how="left")
+            .drop("rank_pair")
         )
-        .sort("player_id", "season", descending=[False, True])
+    return df.with_columns([(pl.col(f"salary{i}") * multiplier).alias(f"salary{i}") for i in range(1, 4)])
+
+EPV_COLUMNS = ["player_name", "pos", "salary", "prev_yrs", "ext_yrs", "YO5", "new_sal"]
+
+def epv_plan(contracts: pl.LazyFrame, extensions: pl.LazyFrame, bands: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Kern der EPV-Berechnung als Polars LazyFrame.
+
+    Parameters:
+    contracts (pl.LazyFrame): Vertragshistorie bis einschließlich der gewählten Saison.
+    extensions (pl.LazyFrame): Eine Zeile pro Spieler und Verlängerungsdauer mit player_id, conference, salary und ext_yrs.
+    bands (pl.LazyFrame): Gehaltsbänder der gewählten Saison (siehe build_salary_bands).
+
+    Returns:
+    pl.LazyFrame: Plan mit player_id und den Spalten aus EPV_COLUMNS.
+    """
+    # Nur Saisons in der Conference des Spielers (oder ohne Conference) berücksichtigen
+    player_conferences = extensions.select(["player_id", pl.col("conference").alias("ext_conference")]).unique()
+
+    # Erster Transformationsschritt: niedrigster Rang je Saison, nur robuste Saisons
+    plan = (
+        contracts
+        .join(player_conferences, on="player_id")
+        .filter((pl.col("conference") == pl.col("ext_conference")) | pl.col("conference").is_null())
+        .drop("ext_conference")
+        .with_columns(YO5 = pl.when(pl.col("contractInfo").str.contains("5YO")).then(pl.lit(1)).otherwise(pl.lit(0)))
         .with_columns(
             min_rank=pl.when(
                 (pl.col("tot_pts_rank") <= pl.col("avg_pts_rank"))
@@ -76,9 +189,9 @@ def calculate_epvs(state):
         .filter(pl.col("is_robust") == 1)
     )
 
-    # Zweiter Transformationsschritt
-    filtered_contracts_df = (
-        filtered_contracts_df
+    # Zweiter Transformationsschritt: Ränge der letzten drei Saisons, nur die jüngste Saison behalten
+    plan = (
+        plan
         .sort(by=["player_id", "season"], descending=[False, True])
         .with_columns(
             pr1=pl.col("min_rank").shift(0).over("player_id"),
@@ -87,102 +200,213 @@ def calculate_epvs(state):
             )
         .filter(pl.col("season") == pl.col("season").max().over("player_id"))
     )
-    
-    # Load Salaries
-    salaries = load_salaries().filter(pl.col("season")==state.selected_season).with_columns(rank = pl.col("salary").rank(method="ordinal",descending=True).over("pos")).sort("pos","rank", descending=[False,False]).select(["pos","rank","salary"])
-    salaries = salaries.with_columns(pl.col("rank").cast(pl.Int32))
-
-    # Liste für neue Einträge
-    special_rows = []
-
-    # Spalten der Tabelle merken (Schema sicherstellen)
-    table_columns = salaries.schema
-
-    # Für jede Position (pos) die spezielle Berechnung durchführen
-    for pos, group in salaries.group_by("pos", maintain_order=True):
-        # Sortiere die Gehälter absteigend
-        group_sorted = group.sort("salary", descending=True)
-        
-        # Sicherstellen, dass genügend Werte vorhanden sind
-        if len(group_sorted) < 4:
-            continue
-
-        # Wichtige Werte extrahieren
-        max_salary = group_sorted[0, "salary"]
-        second_highest_salary = group_sorted[1, "salary"]
-        third_highest_salary = group_sorted[2, "salary"]
-        fourth_highest_salary = group_sorted[3, "salary"]
-
-        # Formel 1: max(salary) + (2 * zweithöchste - dritte - vierte) / 3
-        special_salary_1 = max_salary + (2 * second_highest_salary - third_highest_salary - fourth_highest_salary) / 3
-
-        # Formel 2: 2 * Berechneter Wert aus Formel 1 - max(salary) ursprünglich
-        special_salary_2 = 2 * special_salary_1 - max_salary
-
-        # Zwei neue Einträge mit Standardwerten erstellen
-        special_row_1 = {
-            "pos": pos,
-            "rank": 0,  # Beispielwert für den Rank
-            "salary": special_salary_1,
-        }
-
-        special_row_2 = {
-            "pos": pos,
-            "rank": -1,  # Rank -1 für die zweite spezielle Zeile
-            "salary": special_salary_2,
-        }
-
-        # Neue Zeilen der Liste hinzufügen
-        special_rows.append(special_row_1)
-        special_rows.append(special_row_2)
-
-    # Neue Einträge in die Tabelle einfügen
-    new_rows_df = pl.DataFrame(special_rows, schema=table_columns, infer_schema_length=1)
-    salaries = salaries.vstack(new_rows_df, in_place=False)
-
-    # Unterfunktion zur Berechnung einzelner Ränge
-    def calculate_single_salary(pos, rank, table, multiplier=1.0):
-        salary_values = table.filter(
-            (table["pos"] == pos) & (table["rank"].is_in([rank * 2 - 3, rank * 2 - 2]))
-        )["salary"]
-        return multiplier * salary_values.mean() if len(salary_values) > 0 else None
-
-    # Hauptfunktion zur Berechnung aller Ränge
-    def calculate_salaries(row, end23_sal, jul1_sal):
-        pos = row["pos"]
-        ranks = [row["pr1"], row["pr2"], row["pr3"]]
-        table = end23_sal if row.get("week", 0) == 0 else jul1_sal
-        multiplier = 1.1 if row.get("week", 0) == 0 else 1.0
-        # Für jeden Rank die Berechnung durchführen
-        salaries = [
-            calculate_single_salary(pos, rank, table, multiplier) for rank in ranks
-        ]
-        return salaries
-    
-    # Berechnung der Salaries und Hinzufügen zum DataFrame
-    salary_columns = ["salary1", "salary2", "salary3"]
-    salaries_list = [calculate_salaries(row, salaries, salaries) for row in filtered_contracts_df.to_dicts()]
-    # Umwandlung der salaries_list in ein Dictionary
-    salaries_dict = {
-        salary_columns[i]: [row[i] for row in salaries_list]  # Extrahiere die i-te Spalte aus jeder Zeile
-        for i in range(len(salary_columns))
-    }
-    salaries_df = pl.DataFrame(salaries_dict)
-    main_df = (
-        filtered_contracts_df
-        .with_columns(salaries_df)
+
+    # Gehälter über die Gehaltsbänder per Join zuordnen
+    plan = join_salary_bands(plan, bands)
+
+    plan = (
+        plan
         .rename({"contract_years": "prev_yrs"})
         .drop("salary")
-        .join(pl.from_pandas(state.filtered_df).select(["player_id","salary","contract_years"]).rename({"contract_years": "ext_yrs"}), on="player_id")
-        .select(["player_name", "pos", "salary", "prev_yrs", "ext_yrs", "YO5", "salary1", "salary2", "salary3"])
+        .join(extensions.select(["player_id", "salary", "ext_yrs"]), on="player_id")
+        .select(["player_id", "player_name", "pos", "salary", "prev_yrs", "ext_yrs", "YO5", "salary1", "salary2", "salary3"])
         .with_columns(
             eys=(pl.max_horizontal(["salary", "salary1", "salary2", "salary3"]) * (1.15 - 0.05 * (pl.col("ext_yrs") - pl.col("YO5")))) # hier die 5th yr option rein
             )
     )
-    main_df = calculate_new_salary(main_df).select(["player_name", "pos", "salary", "prev_yrs", "ext_yrs", "YO5", "new_sal"])
+    return calculate_new_salary(plan).select(["player_id"] + EPV_COLUMNS)
+
+def build_epv_plan(extensions: pl.DataFrame, season: int, league_id: int = None) -> pl.LazyFrame:
+    """
+    Baut den vollständigen EPV-Abfrageplan für einzelne Spieler als Polars LazyFrame.
+
+    Die Vertragsdaten werden bereits in der Datenbank auf die übergebenen Spieler, deren Conference und
+    Saisons bis `season` eingeschränkt; alle weiteren Schritte bleiben lazy, bis der Plan mit collect()
+    ausgeführt wird. Mit plan.explain() lässt sich der optimierte Plan ausgeben.
 
-    # Speichere das Ergebnis in den State
-    state.filtered_df = main_df.to_pandas()  # Konvertiere zurück in Pandas-DataFrame, falls Taipy Pandas erwartet
-    navigate(state, "epv")
-    notify(state, "success", f'Fuck this.')
-    pass
\ No newline at end of file
+    Parameters:
+    extensions (pl.DataFrame): Spieler mit Verlängerung, Spalten player_id, conference, salary und ext_yrs.
+    season (int): Die gewählte Saison.
+    league_id (int): Die Liga der Verträge. None berücksichtigt alle Ligen.
+
+    Returns:
+    pl.LazyFrame: Plan mit player_id und den Spalten aus EPV_COLUMNS.
+    """
+    filters = [
+        Filter("player_id", "in", extensions.get_column("player_id").to_list()),
+        Filter("conference", "in", extensions.get_column("conference").to_list() + [None]),
+        Filter("season", "<=", season),
+    ]
+    if league_id is not None:
+        filters.append(Filter("league_id", "==", league_id))
+    contracts = load_contracts(filters=filters).lazy()
+    return epv_plan(contracts, extensions.lazy(), get_salary_bands(season, league_id=league_id).lazy())
+
+def load_materialized_epvs(extensions: pl.DataFrame, season: int, league_id: int = None) -> pl.DataFrame:
+    """
+    Liest vorberechnete EPVs aus der Tabelle 'epv'. Ist die Tabelle nicht vorhanden, wird ein leerer DataFrame zurückgegeben.
+
+    Returns:
+    pl.DataFrame: player_id und die Spalten aus EPV_COLUMNS für alle gefundenen (player_id, ext_yrs)-Paare.
+    """
+    filters = [
+        Filter("season", "==", season),
+        Filter("player_id", "in", extensions.get_column("player_id").to_list()),
+        Filter("ext_yrs", "in", extensions.get_column("ext_yrs").unique().to_list()),
+    ]
+    if league_id is not None:
+        filters.append(Filter("league_id", "==", league_id))
+    try:
+        epvs = load_epv_table(columns=["player_id"] + EPV_COLUMNS, filters=filters)
+    except psycopg2.Error as e:
+        logging.warning(f"Vorberechnete EPVs nicht verfügbar, berechne live: {e}")
+        return pl.DataFrame()
+    return epvs.join(extensions.select(["player_id", "ext_yrs"]), on=["player_id", "ext_yrs"], how="semi")
+
+def materialize_epvs(start_year: int, end_year: int, league_id: int = LEAGUE_ID, max_ext_years: int = EPV_MAX_EXTENSION_YEARS) -> None:
+    """
+    Berechnet die EPVs aller Spieler einer Liga für jede Saison und jede Verlängerungsdauer von 2 bis
+    `max_ext_years` und speichert sie in der Tabelle 'epv'.
+
+    Parameters:
+    start_year (int): Die erste zu berechnende Saison.
+    end_year (int): Die letzte zu berechnende Saison.
+    league_id (int): Die Liga.
+    max_ext_years (int): Die längste vorberechnete Verlängerung.
+    """
+    with get_connection() as conn:
+        contracts = load_table_from_db("contracts", conn, filters=[Filter("league_id", "==", league_id)]).lazy()
+        ext_years = pl.DataFrame({"ext_yrs": list(range(2, max_ext_years + 1))}, schema={"ext_yrs": pl.Int64})
+
+        for season in range(start_year, end_year + 1):
+            extensions = (
+                contracts
+                .filter(pl.col("season") == season)
+                .select(["player_id", "franchise_id", "franchise_name", "conference", "salary"])
+                .unique(subset=["player_id"])
+                .join(ext_years.lazy(), how="cross")
+            )
+            epvs = (
+                epv_plan(contracts.filter(pl.col("season") <= season), extensions, get_salary_bands(season, league_id=league_id).lazy())
+                .join(extensions.select(["player_id", "ext_yrs", "franchise_id", "franchise_name"]), on=["player_id", "ext_yrs"], how="left")
+                .with_columns(season=pl.lit(season), league_id=pl.lit(league_id, pl.Int32))
+                .collect()
+            )
+            write_frame(conn, "epv", epvs, season=season, league_id=league_id)
+            logging.info(f"EPVs of league {league_id} for season {season} written to PostgreSQL database ({epvs.height} rows).")
+
+        with conn.cursor() as cursor:
+            ensure_indexes(cursor, "epv")
+        conn.commit()
+
+def compute_epvs(job_id: str, extensions: pl.DataFrame, season: int, league_id: int = None) -> pl.DataFrame:
+    """
+    Berechnet die EPVs der übergebenen Verlängerungen im Hintergrund. Vorberechnete EPVs werden aus der
+    Tabelle 'epv' gelesen; nur fehlende Verlängerungsdauern werden live berechnet. Zwischen den Stufen wird
+    der Fortschritt gemeldet und auf Abbruch geprüft.
+
+    Parameters:
+    job_id (str): ID des Jobs in services.background_jobs.
+    extensions (pl.DataFrame): Spieler mit Verlängerung, Spalten player_id, conference, salary und ext_yrs.
+    season (int): Die gewählte Saison.
+    league_id (int): Die gewählte Liga.
+
+    Returns:
+    pl.DataFrame: Die Spalten aus EPV_COLUMNS, sortiert nach player_id.
+
+    Raises:
+    JobCancelled: Wenn der Job abgebrochen wurde.
+    """
+    set_stage(job_id, "lese vorberechnete EPVs")
+    with span("epv.load_materialized") as s:
+        materialized = load_materialized_epvs(extensions, season, league_id)
+        s.rows = materialized.height
+    missing = extensions
+    if materialized.height > 0:
+        missing = extensions.join(materialized.select(["player_id", "ext_yrs"]), on=["player_id", "ext_yrs"], how="anti")
+
+    frames = [materialized] if materialized.height > 0 else []
+    if missing.height > 0:
+        set_stage(job_id, f"lade Verträge für {missing.height} Verlängerung(en)")
+        with span("epv.build_plan"):
+            plan = build_epv_plan(missing, season, league_id)
+        if EPV_EXPLAIN:
+            logging.info(f"EPV-Abfrageplan:\n{plan.explain()}")
+        set_stage(job_id, "berechne EPVs")
+        with span("epv.collect") as s:
+            frames.append(plan.collect())
+            s.rows = frames[-1].height
+
+    set_stage(job_id, "fertig")
+    return (
+        pl.concat(frames, how="vertical_relaxed").sort("player_id").select(EPV_COLUMNS)
+        if frames else pl.DataFrame(schema={column: pl.Float64 for column in EPV_COLUMNS})
+    )
+
+def _epv_status(state, status, job_id: str, result=None):
+    """
+    Status-Callback von invoke_long_callback: meldet neue Stufen und übergibt das Ergebnis an den State.
+    `status` ist während der Berechnung die Anzahl der Perioden, danach True (Erfolg) oder False (Fehler).
+    """
+    if isinstance(status, bool):
+        cancelled = is_cancelled(job_id)
+        finish_job(job_id)
+        # Ergebnis nur übernehmen, wenn der Job noch der aktuelle der Session ist
+        if state.epv_job_id != job_id:
+            return
+        state.epv_job_id = None
+        if cancelled:
+            notify(state, "info", "EPV-Berechnung abgebrochen.")
+        elif status and result is not None:
+            state.filtered_df = PagedTable(result)
+            navigate(state, "epv")
+            notify(state, "success", "EPV-Berechnung abgeschlossen.")
+        else:
+            notify(state, "error", "EPV-Berechnung fehlgeschlagen.")
+        return
+
+    stage = next_stage_report(job_id)
+    if stage is not None and state.epv_job_id == job_id:
+        notify(state, "info", f"EPV-Berechnung: {stage}")
+
+def _run_epv_job(job_id: str, extensions: pl.DataFrame, season: int, league_id: int):
+    try:
+        return run_job(job_id, compute_epvs, extensions, season, league_id)
+    except JobCancelled:
+        return None
+
+def calculate_epvs(state):
+    """
+    Startet die EPV-Berechnung für die bearbeiteten Verträge in `state.filtered_df` im Hintergrund.
+    Das Ergebnis wird nach Abschluss in `state.filtered_df` gespeichert und die Seite "epv" geöffnet.
+
+    :param state: Der aktuelle State der Taipy-Anwendung.
+    """
+    if state.epv_job_id is not None:
+        notify(state, "warning", "Es läuft bereits eine EPV-Berechnung.")
+        return
+
+    extensions = (
+        apply_overlay(state.filtered_df.to_polars(), get_state_id(state))
+        .filter(pl.col("contract_years") > 1)
+        .select(["player_id", "conference", "salary", pl.col("contract_years").cast(pl.Int64).alias("ext_yrs")])
+    )
+
+    job_id = create_job(f"epv {state.selected_league} {state.selected_season}")
+    state.epv_job_id = job_id
+    invoke_long_callback(
+        state,
+        _run_epv_job,
+        [job_id, extensions, state.selected_season, int(state.selected_league)],
+        _epv_status,
+        [job_id],
+        period=BACKGROUND_STATUS_PERIOD_MS,
+    )
+    notify(state, "info", "EPV-Berechnung gestartet.")
+
+def cancel_epvs(state):
+    """
+    Bricht die laufende EPV-Berechnung der Session ab (wirksam zwischen zwei Berechnungsstufen).
+    """
+    if state.epv_job_id is None or not cancel_job(state.epv_job_id):
+        notify(state, "warning", "Keine laufende EPV-Berechnung.")
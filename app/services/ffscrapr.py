@@ -1,4 +1,7 @@
-import polars as pl
+import numpy as np
+import pandas as pd
+import rpy2.robjects as ro
+import rpy2.rinterface_lib as rinterface_lib
 from rpy2.robjects.packages import importr
 from rpy2.robjects import pandas2ri
 
@@ -9,26 +12,36 @@ def init_ffscrapr():
     utils.install_packages('nflreadr')
     utils.install_packages('ffscrapr')
 
-def ff_connect(season, league_id):
+def ff_connect(season, league_id, rate_limit=True):
     ffscrapr = importr('ffscrapr')
+    if not rate_limit:
+        # Das Ratenlimit übernimmt dann der Aufrufer (z.B. der TokenBucket des Ingestion-Schedulers)
+        return ffscrapr.mfl_connect(season=season, league_id=league_id, rate_limit=False)
     conn = ffscrapr.mfl_connect(season=season, league_id=league_id, rate_limit_number=1, rate_limit_seconds=6)
     return conn
 
-def get_positions(conn):
-    ffscrapr = importr('ffscrapr')
-    positions = ffscrapr.ff_starter_positions(conn)
-    positions = pandas2ri.rpy2py(positions)
-    positions = pl.from_pandas(positions)
-    positions = positions.select("pos").to_series()
+def _r_to_pandas(r_df) -> pd.DataFrame:
+    df = pandas2ri.rpy2py(r_df)
+    return df.map(lambda x: np.nan if isinstance(x, rinterface_lib.sexp.NACharacterType) else x)
 
-    return positions
+# Abruffunktionen für die Worker-Prozesse des Ingestion-Schedulers.
+# Sie geben pandas DataFrames zurück, da R-Objekte nicht zwischen Prozessen übertragen werden können.
 
-def get_starter(conn, position):
+def fetch_franchises(season, league_id) -> pd.DataFrame:
     ffscrapr = importr('ffscrapr')
-    starter = ffscrapr.ff_starter_positions(conn)
-    starter = pandas2ri.rpy2py(starter)
-    starter = pl.from_pandas(starter)
-    starter = starter.filter(pl.col("pos") == position).select("min").to_numpy()[0][0]
+    return _r_to_pandas(ffscrapr.ff_franchises(ff_connect(season, league_id, rate_limit=False)))
 
-    return starter
+def fetch_rosters(season, league_id) -> pd.DataFrame:
+    ffscrapr = importr('ffscrapr')
+    return _r_to_pandas(ffscrapr.ff_rosters(ff_connect(season, league_id, rate_limit=False)))
 
+def fetch_playerscores(season, league_id, weeks, players=None) -> pd.DataFrame:
+    ffscrapr = importr('ffscrapr')
+    conn = ff_connect(season, league_id, rate_limit=False)
+    playerscores_df_r = ffscrapr.ff_playerscores(conn, season=season, week=ro.IntVector(weeks))
+    with (ro.default_converter + pandas2ri.converter).context():
+        return ro.conversion.get_conversion().rpy2py(playerscores_df_r)
+
+def fetch_starter_positions(season, league_id) -> pd.DataFrame:
+    ffscrapr = importr('ffscrapr')
+    return _r_to_pandas(ffscrapr.ff_starter_positions(ff_connect(season, league_id, rate_limit=False)))
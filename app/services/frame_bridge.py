@@ -0,0 +1,16 @@
+# frame_bridge.py
+
+import pandas as pd
+import polars as pl
+from config.config import FRAME_BRIDGE_ARROW
+
+# Umwandlung von Polars (Berechnung) nach pandas (Taipy-State).
+# Die pandas-Spalten werden als ArrowDtype angelegt: Beide Seiten teilen sich dann die
+# Arrow-Puffer, und die Umwandlung kopiert die Daten nicht.
+
+def to_state_frame(df: pl.DataFrame) -> pd.DataFrame:
+    """
+    Wandelt einen Polars DataFrame in einen pandas DataFrame für den Taipy-State um
+    (Arrow-basierte Spalten, abschaltbar über FRAME_BRIDGE_ARROW).
+    """
+    return df.to_pandas(use_pyarrow_extension_array=FRAME_BRIDGE_ARROW)
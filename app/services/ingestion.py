@@ -0,0 +1,270 @@
+# ingestion.py
+
+import os
+import logging
+import polars as pl
+from datetime import datetime
+from functools import partial
+from psycopg2 import sql
+from services.scraper import fetch_franchises, fetch_rosters, request_count, to_polars
+from services.query import Filter
+from services.bulk_writer import write_frame
+from services.connection_pool import get_connection
+from services.database_service import load_table_from_db
+from services.ingestion_scheduler import IngestionJob, run_ingestion
+from services.league_settings import get_floor_pts_ranks
+from services.playerscores_store import (
+    compact_playerscores, import_csv, ingested_weeks, league_paths, refresh_playerscores, scan_playerscores
+)
+from config.config import LEAGUE_ID
+
+# Abruf- und Schreibpfad: Scraping der MFL-Daten und Berechnung der Verträge.
+# Das Scraping-Backend (und damit rpy2/R) wird erst beim ersten Abruf geladen (siehe services/scraper.py).
+
+def load_season_playerscores(seasons: list, league_id: int = LEAGUE_ID) -> pl.DataFrame:
+    """
+    Lädt die Spieler-Scores der angegebenen Saisons einer Liga aus dem memory-mapped Arrow-Cache.
+
+    Raises:
+    FileNotFoundError: Wenn der Cache fehlt; load_playerscores muss vorher gelaufen sein.
+    """
+    return scan_playerscores([Filter("season", "in", seasons)], cache_path=league_paths(league_id)[1]).collect()
+
+def build_contracts(playerscores: pl.DataFrame, roster: pl.DataFrame, franchises: pl.DataFrame, floor_ranks: pl.DataFrame) -> pl.DataFrame:
+    """
+    Berechnet die Verträge aller enthaltenen Saisons in einem gruppierten Durchlauf.
+    Die Rangfenster laufen über ["pos", "season"], sodass mehrere Saisons gleichzeitig berechnet werden können.
+
+    Parameters:
+    playerscores (pl.DataFrame): Die Spieler-Scores der zu berechnenden Saisons.
+    roster (pl.DataFrame): Die Kader derselben Saisons.
+    franchises (pl.DataFrame): Die Franchises derselben Saisons.
+    floor_ranks (pl.DataFrame): pos, season und floor_pts_rank (siehe league_settings.get_floor_pts_ranks).
+                                Positionen ohne Starter entfallen.
+
+    Returns:
+    pl.DataFrame: Die Verträge aller Saisons.
+    """
+    contracts = (
+        playerscores
+        .group_by(["player_id", "season"])
+        .agg(
+            player_name=pl.col("player_name").first(),
+            pos=pl.col("pos").first(),
+            team=pl.col("team").first(),
+            num_games=pl.col("points").count(),
+            tot_pts=pl.col("points").sum(),
+            avg_pts=pl.col("points").mean()
+        )
+        .with_columns(is_robust=pl.col("num_games") >= 5)
+    )
+
+    contracts = (
+        contracts
+        .with_columns(
+            tot_pts_rank=pl.struct("tot_pts").rank("max", descending=True).over(["pos", "season"]),
+            avg_pts_rank=pl.struct("avg_pts").rank("max", descending=True).over(["pos", "season"])
+        )
+        .join(floor_ranks.select(["pos", "season", "floor_pts_rank"]), on=["pos", "season"])
+    )
+
+    # Doppelte Spalten aus den Joins (z.B. pos aus dem Roster) verwerfen; die Werte aus den Scores bleiben
+    return (
+        contracts
+        .join(roster, on=["player_id", "season"], how="left")
+        .select(pl.exclude("^.*_right$"))
+        .join(
+            franchises.select(["franchise_id", "season", "salaryCapAmount", "conference", "division", "logo"]),
+            on=["franchise_id", "season"],
+            how="left"
+        )
+        .select(pl.exclude("^.*_right$"))
+        .with_columns(
+            salary_rank=pl.struct("salary").rank("ordinal", descending=True).over(["pos", "season", "conference"])
+        )
+    )
+
+def calculate_and_save_contracts(start_year: int, end_year: int, league_id: int = LEAGUE_ID):
+    """
+    Save contracts data for multiple years of one league to a PostgreSQL database.
+    Source tables are loaded once for all missing seasons, which are computed in one pass and written
+    in a single batch.
+    
+    Parameters:
+    start_year (int): The starting year for processing contracts data.
+    end_year (int): The ending year for processing contracts data.
+    league_id (int): The league whose contracts are computed.
+    
+    Returns:
+    None
+    """
+    try:
+        seasons = missing_seasons("contracts", start_year, end_year, league_id)
+        if not seasons:
+            return
+
+        with get_connection() as conn_db:
+            season_filter = [Filter("season", "in", seasons), Filter("league_id", "==", league_id)]
+            contracts = build_contracts(
+                load_season_playerscores(seasons, league_id),
+                load_table_from_db("roster", conn_db, filters=season_filter),
+                load_table_from_db("franchises", conn_db, filters=season_filter),
+                pl.concat([get_floor_pts_ranks(season, league_id) for season in seasons]),
+            ).with_columns(league_id=pl.lit(league_id, pl.Int32))
+
+            # Save the contracts data to the database
+            write_frame(conn_db, "contracts", contracts, season=seasons, league_id=league_id)
+            logging.info(f"Contracts data of league {league_id} for years {seasons} written to PostgreSQL database.")
+    except Exception as e:
+        logging.error(f"Error in calculate_and_save_contracts: {e}")
+        raise
+
+def missing_seasons(table: str, start_year: int, end_year: int, league_id: int = LEAGUE_ID) -> list:
+    """
+    Gibt die Saisons zwischen start_year und end_year zurück, für die `table` noch keine Zeilen der Liga enthält.
+    """
+    with get_connection() as conn_db, conn_db.cursor() as cursor:
+        # Überprüfen, ob die Tabelle existiert
+        cursor.execute("""
+            SELECT EXISTS (
+                SELECT FROM pg_tables
+                WHERE schemaname = 'public' AND tablename = %s
+            );
+        """, (table,))
+        table_exists = cursor.fetchone()[0]
+
+        present = set()
+        if table_exists:
+            cursor.execute(
+                sql.SQL("SELECT DISTINCT season FROM {} WHERE season BETWEEN %s AND %s AND league_id = %s").format(sql.Identifier(table)),
+                (start_year, end_year, league_id),
+            )
+            present = {int(row[0]) for row in cursor.fetchall()}
+
+    for year in sorted(present):
+        logging.info(f"Data for table '{table}', league {league_id} and year {year} already present in database. Skipping.")
+    return [year for year in range(start_year, end_year + 1) if year not in present]
+
+def write_franchises(year: int, league_id: int, franchise_df):
+    """
+    Konvertiert die abgerufenen Franchise-Daten einer Saison und schreibt sie in die Datenbank.
+    """
+    franchise_df = to_polars(franchise_df)
+    franchise_df = franchise_df.with_columns(
+        league_id=pl.lit(league_id, pl.Int32),
+        season=pl.lit(year),
+        timestamp=pl.lit(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    )
+    with get_connection() as conn_db:
+        write_frame(conn_db, "franchises", franchise_df, season=year, league_id=league_id)
+    logging.info(f"Franchise data of league {league_id} for year {year} written to PostgreSQL database.")
+
+def write_rosters(year: int, league_id: int, roster_df):
+    """
+    Konvertiert die abgerufenen Roster-Daten einer Saison und schreibt sie in die Datenbank.
+    """
+    roster_df = to_polars(roster_df)
+    roster_df = (
+        roster_df
+        .with_columns(
+            league_id=pl.lit(league_id, pl.Int32),
+            player_id=pl.col("player_id").cast(pl.Int32),
+            season=pl.lit(year),
+            timestamp=pl.lit(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+    )
+    with get_connection() as conn_db:
+        write_frame(conn_db, "roster", roster_df, season=year, league_id=league_id)
+    logging.info(f"Roster data of league {league_id} for year {year} written to PostgreSQL database.")
+
+def franchise_jobs(start_year: int, end_year: int, league_id: int) -> list:
+    """
+    Erstellt die Abruf-Aufträge für alle fehlenden Franchise-Saisons.
+    """
+    return [
+        IngestionJob(
+            f"franchises {year} {league_id}", fetch_franchises, (year, league_id), partial(write_franchises, year, league_id),
+            request_count("franchises"),
+        )
+        for year in missing_seasons("franchises", start_year, end_year, league_id)
+    ]
+
+def roster_jobs(start_year: int, end_year: int, league_id: int) -> list:
+    """
+    Erstellt die Abruf-Aufträge für alle fehlenden Roster-Saisons.
+    """
+    return [
+        IngestionJob(
+            f"roster {year} {league_id}", fetch_rosters, (year, league_id), partial(write_rosters, year, league_id),
+            request_count("rosters"),
+        )
+        for year in missing_seasons("roster", start_year, end_year, league_id)
+    ]
+
+def load_franchises(start_year: int, end_year: int, league_id: int):
+    """
+    Save franchise data for multiple years to a PostgreSQL database.
+    
+    Parameters:
+    start_year (int): The starting year for processing data.
+    end_year (int): The ending year for processing data.
+    league_id (int): The league ID for connecting to the data source.
+    
+    Returns:
+    None
+    """
+    try:
+        run_ingestion(franchise_jobs(start_year, end_year, league_id))
+    except Exception as e:
+        logging.error(f"Error in load_franchises: {e}")
+        raise
+
+def load_rosters(start_year: int, end_year: int, league_id: int):
+    """
+    Save roster data for multiple years to a PostgreSQL database.
+    
+    Parameters:
+    start_year (int): The starting year for processing roster data.
+    end_year (int): The ending year for processing roster data.
+    league_id (int): The league ID for connecting to the data source.
+    
+    Returns:
+    None
+    """
+    try:
+        run_ingestion(roster_jobs(start_year, end_year, league_id))
+    except Exception as e:
+        logging.error(f"Error in load_rosters: {e}")
+        raise
+
+def load_playerscores(league_id: int = LEAGUE_ID, past_seasons: list = [2024, 2023, 2022, 2021, 2020], max_week: int = 17, save_label: str = 'MFL', refresh_weeks: list = None):
+    """
+    Refresh and load player scores data of one league.
+    Only weeks missing from the partitioned store (plus `refresh_weeks` of the latest season) are scraped.
+    An existing legacy CSV is imported into the store once; afterwards the scores are read from the
+    Arrow IPC cache instead.
+    
+    Parameters:
+    league_id (int): The MFL league ID.
+    past_seasons (list): List of seasons to process.
+    max_week (int): Maximum week number to consider.
+    save_label (str): Label of the legacy CSV file to import.
+    refresh_weeks (list): Weeks of the latest season to scrape again.
+    
+    Returns:
+    pl.LazyFrame: Lazy, memory-mapped scan of the player scores of `past_seasons`.
+    """
+    try:
+        store_dir, cache_path = league_paths(league_id)
+        csv_path = f'{save_label}_PlayerScores.csv'
+        if league_id == LEAGUE_ID and os.path.isfile(csv_path) and not ingested_weeks(store_dir):
+            logging.info(f'Importing playerscore data from {csv_path}')
+            import_csv(csv_path, store_dir)
+
+        refresh_playerscores(league_id, past_seasons, max_week, refresh_weeks, store_dir)
+        compact_playerscores(store_dir, cache_path)
+
+        return scan_playerscores([Filter("season", "in", past_seasons)], cache_path)
+    except Exception as e:
+        logging.error(f"Error in load_playerscores: {e}")
+        raise
@@ -0,0 +1,153 @@
+# ingestion_scheduler.py
+
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, NamedTuple
+from services.metrics import STAGE_ERRORS, record, span
+from config.config import SCRAPER_WORKERS, MFL_RATE_LIMIT_CALLS, MFL_RATE_LIMIT_SECONDS
+
+class IngestionJob(NamedTuple):
+    """
+    Ein Abruf-Auftrag: `fetch(*args)` läuft in einem Worker-Prozess (eigene R-Instanz) und muss daher
+    eine importierbare Funktion auf Modulebene sein. `write(result)` läuft im Hauptprozess, während die
+    nächsten Abrufe bereits laufen. `calls` ist die Anzahl der HTTP-Anfragen an MFL, die der Abruf verbraucht
+    (siehe services.scraper.request_count).
+    """
+    name: str
+    fetch: Callable
+    args: tuple
+    write: Callable
+    calls: int = 1
+
+class TokenBucket:
+    """
+    Globales Ratenlimit über alle Endpunkte: `calls` Aufrufe pro `seconds` Sekunden.
+    """
+    def __init__(self, calls: int = MFL_RATE_LIMIT_CALLS, seconds: float = MFL_RATE_LIMIT_SECONDS):
+        self.capacity = calls
+        self.rate = calls / seconds
+        self.tokens = float(calls)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        Entnimmt `tokens` Token, wenn genügend vorhanden sind, und gibt 0 zurück.
+        Andernfalls wird nichts entnommen und die Wartezeit in Sekunden bis zur Verfügbarkeit zurückgegeben.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Aufträge mit mehr Aufrufen als Kapazität dürfen bei vollem Eimer starten
+            needed = min(tokens, self.capacity)
+            if self.tokens >= needed:
+                self.tokens -= tokens
+                return 0.0
+            return (needed - self.tokens) / self.rate
+
+_bucket = None
+_bucket_lock = threading.Lock()
+
+def default_bucket() -> TokenBucket:
+    """
+    Gibt das prozessweite Ratenlimit zurück. Alle Läufe ohne eigenen Bucket teilen es, sodass auch
+    aufeinanderfolgende Läufe (z.B. Franchises/Roster, Spieler-Scores, Ligaeinstellungen) das Limit einhalten.
+    """
+    global _bucket
+    with _bucket_lock:
+        if _bucket is None:
+            _bucket = TokenBucket()
+        return _bucket
+
+def _timed_fetch(fetch: Callable, args: tuple):
+    start = time.perf_counter()
+    result = fetch(*args)
+    return result, time.perf_counter() - start
+
+def _record(report: dict, stage: str, seconds: float) -> None:
+    entry = report.setdefault(stage, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+    entry["count"] += 1
+    entry["total_s"] += seconds
+    entry["max_s"] = max(entry["max_s"], seconds)
+
+def format_timing_report(report: dict) -> str:
+    """
+    Formatiert den Zeitbericht von run_ingestion() als Tabelle für das Log.
+    """
+    lines = [f"{'stage':<18} {'count':>6} {'total_s':>9} {'max_s':>8}"]
+    for stage, entry in report.items():
+        lines.append(f"{stage:<18} {entry['count']:>6} {entry['total_s']:>9.2f} {entry['max_s']:>8.2f}")
+    return "\n".join(lines)
+
+def run_ingestion(jobs: list, max_workers: int = SCRAPER_WORKERS, bucket: TokenBucket = None) -> dict:
+    """
+    Führt die Abrufe parallel in einem Prozesspool aus und schreibt jedes Ergebnis, sobald es vorliegt.
+    Während ein Ergebnis konvertiert und geschrieben wird, laufen die nächsten Abrufe bereits.
+
+    Parameters:
+    jobs (list): Liste von IngestionJob in der gewünschten Reihenfolge.
+    max_workers (int): Anzahl paralleler Worker-Prozesse.
+    bucket (TokenBucket): Ratenlimit. Standard ist das prozessweite Limit aus default_bucket()
+                          (MFL_RATE_LIMIT_CALLS pro MFL_RATE_LIMIT_SECONDS).
+
+    Returns:
+    dict: Zeitbericht pro Stufe (fetch, write, rate_limit_wait, total) mit Anzahl, Gesamt- und Maximaldauer.
+
+    Raises:
+    RuntimeError: Wenn einzelne Abrufe oder Schreibvorgänge fehlgeschlagen sind (nach Abarbeitung aller übrigen).
+    """
+    report = {}
+    if not jobs:
+        return report
+
+    bucket = bucket or default_bucket()
+    queue = list(jobs)
+    pending = {}
+    errors = []
+    start = time.perf_counter()
+
+    # "spawn", damit jeder Worker eine eigene, frisch gestartete R-Instanz erhält
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        while queue or pending:
+            delay = 0.0
+            while queue and len(pending) < max_workers:
+                delay = bucket.try_acquire(queue[0].calls)
+                if delay > 0:
+                    break
+                job = queue.pop(0)
+                pending[executor.submit(_timed_fetch, job.fetch, job.args)] = job
+
+            if not pending:
+                time.sleep(delay)
+                _record(report, "rate_limit_wait", delay)
+                continue
+
+            done, _ = wait(pending, timeout=delay or None, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                # Der Abruf läuft im Worker-Prozess; Dauer und Zeilen werden hier im Hauptprozess erfasst
+                stage = f"scraper.{job.name.split()[0]}"
+                try:
+                    result, fetch_seconds = future.result()
+                    _record(report, "fetch", fetch_seconds)
+                    record(stage, fetch_seconds, rows=len(result))
+                    write_start = time.perf_counter()
+                    with span(f"{stage}.write"):
+                        job.write(result)
+                    _record(report, "write", time.perf_counter() - write_start)
+                    logging.info(f"Ingestion job '{job.name}' finished.")
+                except Exception as e:
+                    logging.error(f"Ingestion job '{job.name}' failed: {e}")
+                    STAGE_ERRORS.labels(stage).inc()
+                    errors.append(job.name)
+
+    _record(report, "total", time.perf_counter() - start)
+    logging.info(f"Ingestion timing report:\n{format_timing_report(report)}")
+
+    if errors:
+        raise RuntimeError(f"{len(errors)} ingestion job(s) failed: {', '.join(errors)}")
+    return report
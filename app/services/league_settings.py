@@ -0,0 +1,136 @@
+# league_settings.py
+
+import json
+import logging
+import os
+import threading
+from functools import partial
+import polars as pl
+from services.scraper import fetch_franchises, fetch_starter_positions, request_count, to_polars
+from services.ingestion_scheduler import IngestionJob, run_ingestion
+from config.config import LEAGUE_SETTINGS_DIR
+
+# Ligaeinstellungen (Starter-Positionen, Franchises, Salary Cap) pro (season, league_id).
+# Sie werden einmal abgerufen und danach aus dem Speicher bzw. von der Platte gelesen:
+#   {LEAGUE_SETTINGS_DIR}/{league_id}/{season}/starter_positions.parquet
+#   {LEAGUE_SETTINGS_DIR}/{league_id}/{season}/franchises.parquet
+#   {LEAGUE_SETTINGS_DIR}/{league_id}/{season}/settings.json
+
+_settings: dict = {}
+_locks: dict = {}
+_lock = threading.Lock()
+
+def _settings_dir(season: int, league_id: int, settings_dir: str) -> str:
+    return os.path.join(settings_dir, str(league_id), str(season))
+
+def _salary_cap(franchises: pl.DataFrame):
+    if "salaryCapAmount" not in franchises.columns:
+        return None
+    return franchises.select(pl.col("salaryCapAmount").cast(pl.Float64, strict=False).max()).item()
+
+def _read_disk(path: str):
+    if not os.path.isfile(os.path.join(path, "settings.json")):
+        return None
+    with open(os.path.join(path, "settings.json")) as f:
+        settings = json.load(f)
+    settings["starter_positions"] = pl.read_parquet(os.path.join(path, "starter_positions.parquet"))
+    settings["franchises"] = pl.read_parquet(os.path.join(path, "franchises.parquet"))
+    return settings
+
+def _write_disk(path: str, settings: dict) -> None:
+    os.makedirs(path, exist_ok=True)
+    settings["starter_positions"].write_parquet(os.path.join(path, "starter_positions.parquet"))
+    settings["franchises"].write_parquet(os.path.join(path, "franchises.parquet"))
+    # settings.json zuletzt schreiben, da es die Vollständigkeit des Eintrags markiert
+    scalars = {key: value for key, value in settings.items() if not isinstance(value, pl.DataFrame)}
+    with open(os.path.join(path, "settings.json.tmp"), "w") as f:
+        json.dump(scalars, f, indent=2)
+    os.replace(os.path.join(path, "settings.json.tmp"), os.path.join(path, "settings.json"))
+
+def _fetch(season: int, league_id: int) -> dict:
+    # Über den Ingestion-Scheduler, damit die Abrufe das gemeinsame Ratenlimit einhalten
+    results = {}
+    run_ingestion([
+        IngestionJob(
+            f"league_settings {season} {league_id} {name}", fetch, (season, league_id),
+            partial(results.__setitem__, name), request_count(name),
+        )
+        for name, fetch in (("franchises", fetch_franchises), ("starter_positions", fetch_starter_positions))
+    ])
+    franchises = to_polars(results["franchises"])
+    return {
+        "season": season,
+        "league_id": league_id,
+        "starter_positions": to_polars(results["starter_positions"]),
+        "franchises": franchises,
+        "salary_cap": _salary_cap(franchises),
+    }
+
+def get_league_settings(season: int, league_id: int, refresh: bool = False, settings_dir: str = LEAGUE_SETTINGS_DIR) -> dict:
+    """
+    Gibt die Ligaeinstellungen einer Saison zurück. Reihenfolge: Speicher, Platte, Abruf von MFL.
+
+    Parameters:
+    season (int): Die Saison.
+    league_id (int): Die MFL-Liga-ID.
+    refresh (bool): Einstellungen erneut abrufen und Speicher- und Plattencache ersetzen.
+
+    Returns:
+    dict: season, league_id, starter_positions (pl.DataFrame mit pos, min, max),
+          franchises (pl.DataFrame) und salary_cap (float oder None).
+    """
+    key = (season, league_id)
+    with _lock:
+        lock = _locks.setdefault(key, threading.Lock())
+
+    # Gleichzeitige Anfragen für dieselbe Saison lösen nur einen Abruf aus
+    with lock:
+        if not refresh and key in _settings:
+            return _settings[key]
+
+        path = _settings_dir(season, league_id, settings_dir)
+        settings = None if refresh else _read_disk(path)
+        if settings is None:
+            logging.info(f"Fetching league settings for season {season}, league {league_id}.")
+            settings = _fetch(season, league_id)
+            _write_disk(path, settings)
+        _settings[key] = settings
+        return settings
+
+def refresh_league_settings(season: int, league_id: int) -> dict:
+    """
+    Ruft die Ligaeinstellungen einer Saison erneut ab (z.B. nach Änderungen der Liga-Regeln).
+    """
+    return get_league_settings(season, league_id, refresh=True)
+
+def get_positions(season: int, league_id: int) -> pl.Series:
+    """
+    Gibt die Starter-Positionen der Liga zurück.
+    """
+    return get_league_settings(season, league_id)["starter_positions"].select("pos").to_series()
+
+def get_starter(season: int, league_id: int, position: str) -> int:
+    """
+    Gibt die Mindestanzahl an Startern für eine Position zurück.
+    """
+    starter = get_league_settings(season, league_id)["starter_positions"]
+    return starter.filter(pl.col("pos") == position).select("min").to_numpy()[0][0]
+
+def get_floor_pts_ranks(season: int, league_id: int) -> pl.DataFrame:
+    """
+    Gibt pro Starter-Position den Rang des schwächsten Pflicht-Starters der Liga zurück
+    (Anzahl Franchises × Mindestanzahl Starter). Punkteränge darüber gelten nicht mehr als Starter-Niveau.
+
+    Returns:
+    pl.DataFrame: pos, season und floor_pts_rank.
+    """
+    n_franchises = get_league_settings(season, league_id)["franchises"].height
+    positions = get_positions(season, league_id).to_list()
+    return pl.DataFrame(
+        {
+            "pos": positions,
+            "season": [season] * len(positions),
+            "floor_pts_rank": [n_franchises * int(get_starter(season, league_id, pos)) for pos in positions],
+        },
+        schema={"pos": pl.Utf8, "season": pl.Int32, "floor_pts_rank": pl.UInt32},
+    )
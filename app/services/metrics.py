@@ -0,0 +1,163 @@
+# metrics.py
+
+import cProfile
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, start_http_server, write_to_textfile
+from prometheus_client.core import Metric
+from config.config import METRICS_PORT, METRICS_TEXTFILE_DIR, PROFILE_STAGES, PROFILE_DIR
+
+# Leichtgewichtige Instrumentierung: jede Stufe (DB-Verbindung, Abfrage, Frame-Aufbau, Update-Schritte,
+# EPV-Schritte, Scraper-Abrufe) wird als Span erfasst und als Prometheus-Metrik exportiert.
+# Stufennamen sind feste Bezeichner wie "db.query" oder "update.contracts", damit die Zahl der
+# Zeitreihen klein bleibt.
+# Prozesse ohne Metrik-Endpunkt (Datenbank-Update und seine Liga-Worker) schreiben ihre Metriken am Ende
+# mit export_metrics als Textdatei (node_exporter textfile collector) und ins Log.
+
+STAGE_SECONDS = Histogram(
+    "adl_stage_duration_seconds", "Dauer einer Verarbeitungsstufe", ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+STAGE_ROWS = Counter("adl_stage_rows_total", "Von einer Stufe verarbeitete Zeilen", ["stage"])
+STAGE_BYTES = Counter("adl_stage_bytes_total", "Von einer Stufe übertragene Bytes", ["stage"])
+STAGE_ERRORS = Counter("adl_stage_errors_total", "Fehlgeschlagene Ausführungen einer Stufe", ["stage"])
+
+_server_lock = threading.Lock()
+_server_started = False
+# Python erlaubt nur einen aktiven Profiler pro Prozess; gleichzeitige Spans laufen ohne Profil
+_profile_lock = threading.Lock()
+
+class Span:
+    """Messpunkt einer Stufe. Zeilen und Bytes können innerhalb des with-Blocks gesetzt werden."""
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.rows = None
+        self.bytes = None
+
+def record(stage: str, seconds: float, rows: int = None, bytes_: int = None, failed: bool = False) -> None:
+    """
+    Erfasst eine bereits gemessene Stufe (z.B. Scraper-Abrufe aus Worker-Prozessen).
+    """
+    STAGE_SECONDS.labels(stage).observe(seconds)
+    if rows is not None:
+        STAGE_ROWS.labels(stage).inc(rows)
+    if bytes_ is not None:
+        STAGE_BYTES.labels(stage).inc(bytes_)
+    if failed:
+        STAGE_ERRORS.labels(stage).inc()
+
+def _should_profile(stage: str) -> bool:
+    return bool(PROFILE_STAGES) and ("all" in PROFILE_STAGES or stage in PROFILE_STAGES)
+
+def _start_profiler(stage: str) -> cProfile.Profile | None:
+    """
+    Startet cProfile für `stage`, falls gewünscht und kein anderer Profiler im Prozess aktiv ist.
+    Ein belegter Profiler wird übersprungen, statt die gemessene Stufe scheitern zu lassen.
+    """
+    if not _should_profile(stage) or not _profile_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # z.B. ein Debugger oder Coverage-Werkzeug hat sys.setprofile bereits belegt
+        _profile_lock.release()
+        logging.debug(f"Stufe '{stage}' wird nicht profiliert: {e}")
+        return None
+    return profiler
+
+@contextmanager
+def span(stage: str):
+    """
+    Misst die Dauer des with-Blocks als Stufe `stage`.
+
+    Ist die Stufe in PROFILE_STAGES enthalten, läuft der Block zusätzlich unter cProfile; das Profil
+    wird nach PROFILE_DIR geschrieben (auswertbar z.B. mit `python -m pstats` oder snakeviz).
+
+    Beispiel:
+        with span("db.query") as s:
+            df = ...
+            s.rows = df.height
+    """
+    current = Span(stage)
+    profiler = _start_profiler(stage)
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield current
+    except Exception:
+        failed = True
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            _profile_lock.release()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, f"{stage}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+            profiler.dump_stats(path)
+            logging.info(f"Profil der Stufe '{stage}' gespeichert: {path}")
+        record(stage, seconds, current.rows, current.bytes, failed)
+
+def start_metrics_server(port: int = METRICS_PORT) -> bool:
+    """
+    Startet den Metrik-Endpunkt (Prometheus-Textformat unter http://host:port/metrics) einmal pro Prozess.
+    Mit Port 0 bleibt der Endpunkt abgeschaltet.
+    """
+    global _server_started
+    with _server_lock:
+        if _server_started or not port:
+            return False
+        try:
+            start_http_server(port)
+        except OSError as e:
+            # z.B. wenn der Taipy-Reloader den Prozess neu startet und der Port noch belegt ist
+            logging.warning(f"Metrik-Endpunkt auf Port {port} nicht gestartet: {e}")
+            return False
+        _server_started = True
+        logging.info(f"Metrik-Endpunkt gestartet auf Port {port}.")
+        return True
+
+class _ProcessLabel:
+    """Collector, der alle Metriken des Standard-Registers mit dem Label process=`name` versieht."""
+    def __init__(self, name: str):
+        self.name = name
+
+    def collect(self):
+        for family in REGISTRY.collect():
+            metric = Metric(family.name, family.documentation, family.type, family.unit)
+            for sample in family.samples:
+                metric.add_sample(sample.name, {**sample.labels, "process": self.name}, sample.value, sample.timestamp)
+            yield metric
+
+def export_metrics(name: str, directory: str = METRICS_TEXTFILE_DIR) -> None:
+    """
+    Schreibt die Metriken eines Prozesses ohne Metrik-Endpunkt nach `directory`/`name`.prom und fasst
+    die Stufen im Log zusammen. Das Label process=`name` hält die Dateien mehrerer Prozesse auseinander.
+    Ohne Verzeichnis wird nur geloggt.
+    """
+    stages = {}
+    for family in STAGE_SECONDS.collect():
+        for sample in family.samples:
+            if sample.name.endswith("_count"):
+                stages.setdefault(sample.labels["stage"], [0, 0.0])[0] = int(sample.value)
+            elif sample.name.endswith("_sum"):
+                stages.setdefault(sample.labels["stage"], [0, 0.0])[1] = sample.value
+    for stage, (count, seconds) in sorted(stages.items()):
+        logging.info(f"Stufe '{stage}': {count}x, {seconds:.2f}s")
+
+    if not directory:
+        return
+    registry = CollectorRegistry()
+    registry.register(_ProcessLabel(name))
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.prom")
+    try:
+        write_to_textfile(path, registry)
+    except OSError as e:
+        logging.warning(f"Metriken nicht nach {path} geschrieben: {e}")
+        return
+    logging.info(f"Metriken gespeichert: {path}")
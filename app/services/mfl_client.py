@@ -0,0 +1,216 @@
+# mfl_client.py
+
+import asyncio
+import logging
+import time
+import httpx
+import polars as pl
+from config.config import MFL_BASE_URL, MFL_MAX_RETRIES, MFL_RATE_LIMIT_CALLS, MFL_RATE_LIMIT_SECONDS
+
+# Nativer MFL-Client ohne R: fragt die Export-API direkt ab und liefert Polars DataFrames
+# mit denselben Spaltennamen wie die entsprechenden ffscrapr-Funktionen.
+
+_ROSTER_SCHEMA = {
+    "franchise_id": pl.Utf8, "franchise_name": pl.Utf8, "player_id": pl.Int32,
+    "roster_status": pl.Utf8, "salary": pl.Float64, "contract_years": pl.Int32,
+}
+
+def _as_list(value) -> list:
+    # Die MFL-API liefert einzelne Einträge als Objekt statt als Liste
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _player_name(name: str) -> str:
+    # "Mahomes, Patrick" -> "Patrick Mahomes" (wie ffscrapr)
+    if not name or ", " not in name:
+        return name
+    last, first = name.split(", ", 1)
+    return f"{first} {last}"
+
+class MFLClient:
+    """
+    Asynchroner Client für die MFL-Export-API mit Ratenlimit und Wiederholungen.
+
+    Beispiel:
+        async with MFLClient(2024, 60206) as client:
+            franchises = await client.franchises()
+    """
+    def __init__(self, season: int, league_id: int, base_url: str = MFL_BASE_URL,
+                 calls: int = MFL_RATE_LIMIT_CALLS, seconds: float = MFL_RATE_LIMIT_SECONDS,
+                 max_retries: int = MFL_MAX_RETRIES):
+        self.season = season
+        self.league_id = league_id
+        self.base_url = base_url.rstrip("/")
+        self.interval = seconds / calls if calls else 0.0
+        self.max_retries = max_retries
+        self._next_call = 0.0
+        self._lock = asyncio.Lock()
+        self._client = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(follow_redirects=True, timeout=30.0)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    async def _throttle(self) -> None:
+        async with self._lock:
+            delay = self._next_call - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_call = time.monotonic() + self.interval
+
+    async def export(self, type_: str, **params) -> dict:
+        """
+        Ruft einen Export-Endpunkt ab. Bei 429, 5xx oder Verbindungsfehlern wird mit exponentiellem
+        Backoff (bzw. Retry-After) bis zu `max_retries`-mal wiederholt.
+
+        Raises:
+        httpx.HTTPError: Wenn die Anfrage auch nach allen Wiederholungen fehlschlägt.
+        """
+        url = f"{self.base_url}/{self.season}/export"
+        query = {"TYPE": type_, "L": self.league_id, "JSON": 1, **params}
+        for attempt in range(self.max_retries + 1):
+            await self._throttle()
+            try:
+                response = await self._client.get(url, params=query)
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return response.json()
+                delay = float(response.headers.get("Retry-After", 2 ** attempt))
+                error = httpx.HTTPStatusError(f"MFL returned {response.status_code}", request=response.request, response=response)
+            except httpx.TransportError as e:
+                delay, error = 2 ** attempt, e
+            if attempt == self.max_retries:
+                raise error
+            logging.warning(f"MFL request {type_} failed ({error}), retrying in {delay:.0f}s.")
+            await asyncio.sleep(delay)
+
+    async def league(self) -> dict:
+        return (await self.export("league"))["league"]
+
+    async def players(self) -> pl.DataFrame:
+        players = _as_list((await self.export("players", DETAILS=1))["players"].get("player"))
+        return pl.DataFrame(
+            {
+                "player_id": [int(p["id"]) for p in players],
+                "player_name": [_player_name(p.get("name")) for p in players],
+                "pos": [p.get("position") for p in players],
+                "team": [p.get("team") for p in players],
+            },
+            schema={"player_id": pl.Int32, "player_name": pl.Utf8, "pos": pl.Utf8, "team": pl.Utf8},
+        )
+
+    async def franchises(self) -> pl.DataFrame:
+        """
+        Entspricht ffscrapr::ff_franchises(): franchise_id, franchise_name, division, division_name,
+        conference, conference_name sowie alle übrigen Franchise-Felder (z.B. logo, salaryCapAmount).
+        """
+        league = await self.league()
+        divisions = {d["id"]: d.get("name") for d in _as_list((league.get("divisions") or {}).get("division"))}
+        conferences = {c["id"]: c.get("name") for c in _as_list((league.get("conferences") or {}).get("conference"))}
+        rows = []
+        for franchise in _as_list(league["franchises"].get("franchise")):
+            row = {"franchise_id": franchise.get("id"), "franchise_name": franchise.get("name")}
+            row.update({key: value for key, value in franchise.items() if key not in ("id", "name")})
+            row["division_name"] = divisions.get(row.get("division"))
+            row["conference_name"] = conferences.get(row.get("conference"))
+            rows.append(row)
+        return pl.DataFrame(rows, infer_schema_length=None)
+
+    async def rosters(self) -> pl.DataFrame:
+        """
+        Entspricht ffscrapr::ff_rosters(): franchise_id, franchise_name, player_id, player_name, pos, team,
+        roster_status, salary, contract_years sowie alle übrigen Vertragsfelder (z.B. contractInfo, drafted).
+        """
+        league, rosters, players = await asyncio.gather(self.league(), self.export("rosters"), self.players())
+        names = {f["id"]: f.get("name") for f in _as_list(league["franchises"].get("franchise"))}
+        rows = []
+        for franchise in _as_list(rosters["rosters"].get("franchise")):
+            for player in _as_list(franchise.get("player")):
+                row = {
+                    "franchise_id": franchise["id"],
+                    "franchise_name": names.get(franchise["id"]),
+                    "player_id": int(player["id"]),
+                    "roster_status": player.get("status"),
+                    "salary": float(player["salary"]) if player.get("salary") else None,
+                    "contract_years": int(player["contractYear"]) if player.get("contractYear") else None,
+                }
+                row.update({key: value for key, value in player.items() if key not in ("id", "status", "salary", "contractYear")})
+                rows.append(row)
+        if not rows:
+            return pl.DataFrame(schema=_ROSTER_SCHEMA).join(players, on="player_id", how="left")
+        roster_df = pl.DataFrame(rows, infer_schema_length=None).with_columns(
+            [pl.col(name).cast(dtype) for name, dtype in _ROSTER_SCHEMA.items()]
+        )
+        first = ["franchise_id", "franchise_name", "player_id", "player_name", "pos", "team",
+                 "roster_status", "salary", "contract_years"]
+        return (
+            roster_df
+            .join(players, on="player_id", how="left")
+            .select(first + [col for col in roster_df.columns if col not in first])
+        )
+
+    async def playerscores(self, weeks: list, players: pl.DataFrame = None) -> pl.DataFrame:
+        """
+        Entspricht ffscrapr::ff_playerscores(): season, week, player_id, player_name, pos, team, points,
+        is_available. Ist `players` angegeben (siehe fetch_players), wird die Spielerliste nicht erneut abgerufen.
+        """
+        if players is None:
+            players = await self.players()
+        responses = await asyncio.gather(*(self.export("playerScores", W=week, YEAR=self.season) for week in weeks))
+        rows = [
+            {
+                "season": self.season,
+                "week": week,
+                "player_id": int(score["id"]),
+                "points": float(score["score"]) if score.get("score") not in (None, "") else None,
+                "is_available": score.get("isAvailable") == "1",
+            }
+            for week, response in zip(weeks, responses)
+            for score in _as_list(response["playerScores"].get("playerScore"))
+        ]
+        scores = pl.DataFrame(
+            rows,
+            schema={"season": pl.Int32, "week": pl.Int32, "player_id": pl.Int32, "points": pl.Float64, "is_available": pl.Boolean},
+        )
+        return (
+            scores
+            .join(players, on="player_id", how="left")
+            .select(["season", "week", "player_id", "player_name", "pos", "team", "points", "is_available"])
+        )
+
+    async def starter_positions(self) -> pl.DataFrame:
+        """
+        Entspricht ffscrapr::ff_starter_positions(): pos, min, max.
+        """
+        starters = (await self.league()).get("starters") or {}
+        rows = []
+        for position in _as_list(starters.get("position")):
+            low, _, high = str(position.get("limit", "0")).partition("-")
+            rows.append({"pos": position["name"], "min": int(low), "max": int(high or low)})
+        return pl.DataFrame(rows, schema={"pos": pl.Utf8, "min": pl.Int32, "max": pl.Int32})
+
+# Synchrone Abruffunktionen für die Worker-Prozesse des Ingestion-Schedulers (gleiche Signaturen wie in ffscrapr.py).
+# Wie bei ffscrapr übernimmt der TokenBucket des Schedulers das Ratenlimit; der Client drosselt nicht zusätzlich.
+
+async def _fetch(season: int, league_id: int, method: str, *args) -> pl.DataFrame:
+    async with MFLClient(season, league_id, seconds=0.0) as client:
+        return await getattr(client, method)(*args)
+
+def fetch_franchises(season, league_id) -> pl.DataFrame:
+    return asyncio.run(_fetch(season, league_id, "franchises"))
+
+def fetch_rosters(season, league_id) -> pl.DataFrame:
+    return asyncio.run(_fetch(season, league_id, "rosters"))
+
+def fetch_players(season, league_id) -> pl.DataFrame:
+    return asyncio.run(_fetch(season, league_id, "players"))
+
+def fetch_playerscores(season, league_id, weeks, players=None) -> pl.DataFrame:
+    return asyncio.run(_fetch(season, league_id, "playerscores", list(weeks), players))
+
+def fetch_starter_positions(season, league_id) -> pl.DataFrame:
+    return asyncio.run(_fetch(season, league_id, "starter_positions"))
@@ -0,0 +1,120 @@
+# paged_table.py
+
+import threading
+import polars as pl
+from services.database_service import load_page_from_db, load_table_from_db
+from services.edit_overlay import cast_value
+from services.query import apply_query
+
+# Serverseitige Datenquelle für Taipy-Tabellen: Statt den ganzen Frame an den Browser zu senden,
+# werden Sortierung, Filter und Seitenabfragen der Tabelle auf einen Polars-Frame oder eine
+# Datenbanktabelle übertragen und nur die sichtbare Seite zurückgegeben.
+# Die Anbindung an Taipy liegt in services/paged_table_accessor.py.
+
+# Ursprüngliche Zeilennummer; dient Taipy als Zeilenindex (z.B. in on_edit)
+ROW_COLUMN = "_row"
+
+class PagedTable:
+    """
+    Seitenweise lesbare Tabelle für den Taipy-State, entweder über einem Polars-Frame (z.B. dem
+    Ergebnis von filter_table) oder über einer Datenbanktabelle mit optionalen Filtern.
+
+    Beispiel:
+        state.filtered_df = PagedTable(contracts_df)
+        state.all_contracts = PagedTable(table="contracts", filters=[Filter("season", "==", 2024)])
+    """
+    def __init__(self, df: pl.DataFrame = None, table: str = None, columns: list = None, filters: list = None):
+        if (df is None) == (table is None):
+            raise ValueError("Entweder df oder table muss angegeben werden.")
+        self._df = df.with_row_index(ROW_COLUMN) if df is not None else None
+        self.table = table
+        self.columns = columns
+        self.filters = list(filters or [])
+        self._schema = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        if self._df is not None:
+            return self._df.height
+        return self.page(0, 0)[1]
+
+    def schema(self) -> dict:
+        """
+        Gibt Spaltennamen und Polars-Datentypen zurück (ohne die Zeilennummer).
+        """
+        if self._df is not None:
+            return {name: dtype for name, dtype in self._df.schema.items() if name != ROW_COLUMN}
+        # Das Schema einer Datenbanktabelle wird einmal abgefragt und danach wiederverwendet
+        if self._schema is None:
+            frame, _ = load_page_from_db(self.table, self.columns, self.filters, limit=0)
+            self._schema = dict(frame.schema)
+        return self._schema
+
+    def _coerce(self, filters: list) -> list:
+        # Filterwerte aus dem Browser kommen als Text; sie werden in den Spaltentyp umgewandelt
+        schema = self.schema()
+        coerced = []
+        for f in filters:
+            if f.op != "contains" and f.column in schema:
+                f = f._replace(value=pl.Series([f.value]).cast(schema[f.column], strict=False)[0])
+            coerced.append(f)
+        return coerced
+
+    def page(self, start: int, end: int = None, order_by: str = None, descending: bool = False,
+             filters: list = None) -> tuple[pl.DataFrame, int]:
+        """
+        Gibt die Zeilen `start` bis einschließlich `end` nach Filterung und Sortierung zurück.
+
+        Returns:
+        tuple: (Seite mit der Spalte ROW_COLUMN, Anzahl aller gefilterten Zeilen)
+        """
+        start = max(0, int(start or 0))
+        limit = None if end is None or int(end) < 0 else int(end) - start + 1
+        filters = self.filters + self._coerce(filters or [])
+        if order_by not in self.schema():
+            order_by = None
+
+        if self._df is None:
+            page_df, total = load_page_from_db(
+                self.table, self.columns, filters, order_by, descending, limit, start
+            )
+            return page_df.with_row_index(ROW_COLUMN, offset=start), total
+
+        with self._lock:
+            df = self._df
+        df = apply_query(df, filters=filters)
+        total = df.height
+        if order_by:
+            df = df.sort(order_by, descending=descending, nulls_last=True)
+        return df.slice(start, limit), total
+
+    def row(self, index: int) -> dict:
+        """
+        Gibt die Zeile mit der ursprünglichen Zeilennummer `index` zurück.
+        """
+        if self._df is None:
+            raise TypeError("Zeilenzugriff ist nur für Frame-basierte Tabellen möglich.")
+        with self._lock:
+            return self._df.row(int(index), named=True)
+
+    def set_cell(self, index: int, column: str, value) -> None:
+        """
+        Ändert eine einzelne Zelle, ohne den Frame zu kopieren.
+
+        Raises:
+        TypeError: Wenn die Tabelle aus der Datenbank gelesen wird.
+        ValueError: Wenn sich der Wert nicht in den Spaltentyp umwandeln lässt (siehe edit_overlay.cast_value).
+        """
+        if self._df is None:
+            raise TypeError("Nur Frame-basierte Tabellen sind bearbeitbar.")
+        with self._lock:
+            self._df[int(index), column] = cast_value(value, self._df.schema[column])
+
+    def to_polars(self) -> pl.DataFrame:
+        """
+        Gibt die vollständige Tabelle als Polars DataFrame zurück.
+        """
+        if self._df is None:
+            return load_table_from_db(self.table, columns=self.columns, filters=self.filters)
+        with self._lock:
+            return self._df.drop(ROW_COLUMN)
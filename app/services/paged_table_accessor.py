@@ -0,0 +1,70 @@
+# paged_table_accessor.py
+
+import polars as pl
+from taipy.gui import Gui
+from taipy.gui.data.data_accessor import _DataAccessor
+from taipy.gui.data.pandas_data_accessor import _PandasDataAccessor
+from services.frame_bridge import to_state_frame
+from services.paged_table import ROW_COLUMN, PagedTable
+from services.query import Filter
+
+# Anbindung von PagedTable an Taipy-Tabellen. Taipy 3.1 bietet dafür keine öffentliche Schnittstelle;
+# dieses Modul ist die einzige Stelle der Anwendung, die private Taipy-APIs verwendet:
+#   - taipy.gui.data.data_accessor._DataAccessor (Basisklasse des Datenzugriffs)
+#   - taipy.gui.data.pandas_data_accessor._PandasDataAccessor (Formatierung der sichtbaren Seite)
+#   - Gui._register_data_accessor (Registrierung, siehe register_paged_tables)
+# Bei einem Update von taipy (requirements.txt) sind diese drei Stellen zu prüfen.
+
+# Filteraktionen der Taipy-Tabelle -> Operatoren von services.query.Filter
+_FILTER_ACTIONS = {"==": "==", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">=", "contains": "contains"}
+
+class PagedTableAccessor(_DataAccessor):
+    """
+    Taipy-Datenzugriff für PagedTable. Die sichtbare Seite wird als kleiner pandas-Frame erzeugt und
+    für die Serialisierung an den pandas-Datenzugriff von Taipy übergeben.
+    """
+    def __init__(self):
+        self._pandas = _PandasDataAccessor()
+
+    @staticmethod
+    def get_supported_classes() -> list:
+        return [PagedTable.__name__]
+
+    def get_col_types(self, var_name: str, value: PagedTable):
+        # Spaltentypen mit NumPy-Namen ("int64", "float64", "object"), die das Taipy-Frontend kennt;
+        # Arrow-Namen wie "double[pyarrow]" würden als Text formatiert
+        empty = pl.DataFrame(schema=value.schema())
+        return self._pandas.get_col_types(var_name, empty.to_pandas())
+
+    def get_data(self, guiApp, var_name: str, value: PagedTable, payload: dict, data_format):
+        filters = [
+            Filter(f["col"], _FILTER_ACTIONS[f["action"]], f.get("value"))
+            for f in payload.get("filters") or []
+            if f.get("action") in _FILTER_ACTIONS
+        ]
+        start = max(0, int(payload.get("start", 0) or 0))
+        page_df, total = value.page(
+            start,
+            payload.get("end"),
+            payload.get("orderby") or None,
+            payload.get("sort") == "desc",
+            filters,
+        )
+        page = to_state_frame(page_df.drop(ROW_COLUMN))
+        page.index = page_df.get_column(ROW_COLUMN).to_list()
+
+        # Die Seite ist bereits gefiltert und sortiert; Taipy formatiert nur noch die Zeilen
+        page_payload = {**payload, "start": 0, "end": max(len(page) - 1, 0), "orderby": None, "filters": []}
+        result = self._pandas.get_data(guiApp, var_name, page, page_payload, data_format)
+        formatted = result.get("value", result)
+        if isinstance(formatted, dict) and "rowcount" in formatted:
+            formatted["rowcount"] = total
+            formatted["start"] = start
+        return result
+
+def register_paged_tables(gui: Gui) -> None:
+    """
+    Meldet PagedTable bei Taipy an, sodass Tabellen nur die sichtbare Seite laden
+    (Sortierung und Filter serverseitig).
+    """
+    gui._register_data_accessor(PagedTableAccessor)
@@ -0,0 +1,246 @@
+# playerscores_store.py
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from functools import partial
+import polars as pl
+from services.scraper import fetch_players, fetch_playerscores, preloads_players, request_count, to_polars
+from services.ingestion_scheduler import IngestionJob, run_ingestion
+from services.query import compile_filter_polars
+from config.config import LEAGUE_ID, PLAYERSCORES_STORE_DIR, PLAYERSCORES_CACHE_PATH
+
+# Spieler-Scores werden pro Saison und Woche als eigene Parquet-Datei abgelegt:
+#   {PLAYERSCORES_STORE_DIR}/season=2024/week=07.parquet
+# Das Manifest hält fest, welche Wochen bereits vollständig eingelesen wurden.
+# Für Lesezugriffe werden alle Wochen zu einer unkomprimierten Arrow-IPC-Datei (PLAYERSCORES_CACHE_PATH)
+# zusammengefasst, die per Memory-Mapping lazy gescannt wird.
+# Jede Liga hat einen eigenen Speicher und Cache (siehe league_paths).
+
+_manifest_lock = threading.Lock()
+
+def _manifest_path(store_dir: str) -> str:
+    return os.path.join(store_dir, "manifest.json")
+
+def league_paths(league_id: int) -> tuple[str, str]:
+    """
+    Gibt Speicherverzeichnis und Cache-Datei einer Liga zurück:
+      {PLAYERSCORES_STORE_DIR}/league={league_id}/season=.../week=...parquet
+      {PLAYERSCORES_CACHE_PATH ohne Endung}_{league_id}.arrow
+    Ein Speicher ohne Liga-Ebene (vor der Mehrliga-Unterstützung) wird der Liga LEAGUE_ID zugeordnet.
+    """
+    store_dir = os.path.join(PLAYERSCORES_STORE_DIR, f"league={league_id}")
+    root, ext = os.path.splitext(PLAYERSCORES_CACHE_PATH)
+    if league_id == LEAGUE_ID:
+        _migrate_legacy_store(store_dir)
+    return store_dir, f"{root}_{league_id}{ext}"
+
+def _migrate_legacy_store(store_dir: str) -> None:
+    if os.path.exists(store_dir) or not os.path.isfile(_manifest_path(PLAYERSCORES_STORE_DIR)):
+        return
+    os.makedirs(store_dir)
+    for name in os.listdir(PLAYERSCORES_STORE_DIR):
+        if name.startswith("season=") or name == "manifest.json":
+            os.replace(os.path.join(PLAYERSCORES_STORE_DIR, name), os.path.join(store_dir, name))
+    logging.info(f"Player scores store moved to {store_dir}.")
+
+def partition_path(season: int, week: int, store_dir: str = PLAYERSCORES_STORE_DIR) -> str:
+    return os.path.join(store_dir, f"season={season}", f"week={week:02d}.parquet")
+
+def read_manifest(store_dir: str = PLAYERSCORES_STORE_DIR) -> dict:
+    """
+    Liest das Manifest. Schlüssel sind "season-week", Werte enthalten Zeilenzahl und Zeitpunkt des Einlesens.
+    """
+    path = _manifest_path(store_dir)
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def ingested_weeks(store_dir: str = PLAYERSCORES_STORE_DIR) -> set:
+    """
+    Gibt die Menge der bereits eingelesenen (season, week)-Paare zurück.
+    """
+    return {(entry["season"], entry["week"]) for entry in read_manifest(store_dir).values()}
+
+def write_partition(season: int, week: int, df: pl.DataFrame, store_dir: str = PLAYERSCORES_STORE_DIR) -> None:
+    """
+    Schreibt die Scores einer Woche als Parquet-Datei und trägt sie ins Manifest ein.
+    Datei und Manifest werden jeweils atomar ersetzt.
+    """
+    path = partition_path(season, week, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.write_parquet(f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+    with _manifest_lock:
+        manifest = read_manifest(store_dir)
+        manifest[f"{season}-{week:02d}"] = {
+            "season": season,
+            "week": week,
+            "rows": df.height,
+            "ingested_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        manifest_path = _manifest_path(store_dir)
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+def _cast_playerscores(df: pl.DataFrame) -> pl.DataFrame:
+    if "is_available" in df.columns:
+        df = df.drop("is_available")
+    return df.with_columns(
+        season=pl.col("season").cast(pl.Int32),
+        week=pl.col("week").cast(pl.Int32),
+        player_id=pl.col("player_id").cast(pl.Int32),
+        points=pl.col("points").cast(pl.Float64),
+    )
+
+def clean_playerscores(playerscores_df) -> pl.DataFrame:
+    """
+    Bereinigt die abgerufenen Scores einer Woche und konvertiert sie nach Polars.
+    """
+    return _cast_playerscores(to_polars(playerscores_df))
+
+def _store_week(season: int, week: int, store_dir: str, playerscores_df) -> None:
+    # Noch nicht gespielte Wochen liefern keine Zeilen und bleiben fehlend
+    if len(playerscores_df) == 0:
+        logging.info(f"No player scores for season {season} week {week} yet.")
+        return
+    write_partition(season, week, clean_playerscores(playerscores_df), store_dir)
+
+def completed_weeks(season: int, max_week: int, today: date = None) -> int:
+    """
+    Schätzt die Anzahl der abgeschlossenen NFL-Wochen einer Saison anhand des Kalenders.
+
+    Woche 1 beginnt am Donnerstag nach dem ersten Montag im September (Labor Day); eine Woche gilt ab dem
+    folgenden Dienstag als abgeschlossen.
+    """
+    today = today or date.today()
+    first_monday = date(season, 9, 1) + timedelta(days=(7 - date(season, 9, 1).weekday()) % 7)
+    kickoff = first_monday + timedelta(days=3)
+    completed = ((today - kickoff).days + 2) // 7
+    return max(0, min(max_week, completed))
+
+def weeks_to_fetch(seasons: list, max_week: int, refresh_weeks: list = None, store_dir: str = PLAYERSCORES_STORE_DIR) -> list:
+    """
+    Bestimmt die abzurufenden (season, week)-Paare: alle fehlenden, bereits abgeschlossenen Wochen sowie
+    die Wochen der jüngsten Saison in `refresh_weeks` (z.B. für Stat-Korrekturen).
+    """
+    done = ingested_weeks(store_dir)
+    current_season = max(seasons)
+    todo = []
+    for season in seasons:
+        for week in range(1, completed_weeks(season, max_week) + 1):
+            if (season, week) not in done or (season == current_season and week in (refresh_weeks or [])):
+                todo.append((season, week))
+    return todo
+
+def refresh_playerscores(league_id: int, seasons: list, max_week: int = 17, refresh_weeks: list = None, store_dir: str = PLAYERSCORES_STORE_DIR) -> int:
+    """
+    Ruft nur fehlende (bzw. explizit angeforderte) Wochen ab und legt sie im Speicher ab.
+    Ein wöchentliches Update während der Saison kostet damit genau einen Abruf.
+
+    Parameters:
+    league_id (int): Die MFL-Liga-ID.
+    seasons (list): Die zu berücksichtigenden Saisons.
+    max_week (int): Letzte Woche einer Saison.
+    refresh_weeks (list): Wochen der jüngsten Saison, die erneut abgerufen werden.
+
+    Returns:
+    int: Anzahl der abgerufenen Wochen.
+    """
+    todo = weeks_to_fetch(seasons, max_week, refresh_weeks, store_dir)
+    players = {}
+    if todo and preloads_players():
+        run_ingestion(
+            [
+                IngestionJob(
+                    f"players {season}", fetch_players, (season, league_id), partial(players.__setitem__, season),
+                    request_count("players"),
+                )
+                for season in sorted({season for season, _ in todo})
+            ]
+        )
+    jobs = [
+        IngestionJob(
+            f"playerscores {season} week {week}",
+            fetch_playerscores,
+            (season, league_id, [week], players.get(season)),
+            lambda df, season=season, week=week: _store_week(season, week, store_dir, df),
+            request_count("playerscores", 1, season in players),
+        )
+        for season, week in todo
+    ]
+    run_ingestion(jobs)
+    logging.info(f"Player scores refresh fetched {len(todo)} week(s).")
+    return len(todo)
+
+def import_csv(csv_path: str, store_dir: str = PLAYERSCORES_STORE_DIR) -> None:
+    """
+    Übernimmt eine bestehende Scores-CSV (z.B. MFL_PlayerScores.csv) einmalig in den partitionierten Speicher.
+    """
+    df = _cast_playerscores(pl.read_csv(csv_path))
+    for (season, week), part in df.group_by(["season", "week"]):
+        write_partition(int(season), int(week), part, store_dir)
+    logging.info(f"Imported {df.height} player score rows from {csv_path}.")
+
+def read_playerscores(seasons: list = None, store_dir: str = PLAYERSCORES_STORE_DIR) -> pl.DataFrame:
+    """
+    Liest die eingelesenen Wochen (optional nur der angegebenen Saisons) als einen DataFrame,
+    sortiert nach player_id, season und week.
+    """
+    paths = [
+        partition_path(entry["season"], entry["week"], store_dir)
+        for entry in read_manifest(store_dir).values()
+        if seasons is None or entry["season"] in seasons
+    ]
+    if not paths:
+        return pl.DataFrame()
+    return pl.concat([pl.scan_parquet(path, hive_partitioning=False) for path in paths], how="diagonal_relaxed").sort(["player_id", "season", "week"]).collect()
+
+def compact_playerscores(store_dir: str = PLAYERSCORES_STORE_DIR, cache_path: str = PLAYERSCORES_CACHE_PATH, force: bool = False) -> str:
+    """
+    Fasst alle Wochen zu einer unkomprimierten Arrow-IPC-Datei zusammen, sortiert nach season, pos und player_id.
+    Die Datei wird nur neu geschrieben, wenn das Manifest jünger ist als sie (oder `force` gesetzt ist).
+
+    Returns:
+    str: Pfad der IPC-Datei.
+    """
+    manifest_path = _manifest_path(store_dir)
+    if not force and os.path.isfile(cache_path) and (
+        not os.path.isfile(manifest_path) or os.path.getmtime(cache_path) >= os.path.getmtime(manifest_path)
+    ):
+        return cache_path
+
+    df = read_playerscores(store_dir=store_dir)
+    if df.height > 0:
+        df = df.sort(["season", "pos", "player_id", "week"])
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    df.write_ipc(f"{cache_path}.tmp", compression="uncompressed")
+    os.replace(f"{cache_path}.tmp", cache_path)
+    logging.info(f"Player scores cache written to {cache_path} ({df.height} rows).")
+    return cache_path
+
+def scan_playerscores(filters: list = None, cache_path: str = PLAYERSCORES_CACHE_PATH) -> pl.LazyFrame:
+    """
+    Scannt den Scores-Cache lazy per Memory-Mapping. Filter (z.B. auf season, pos oder player_id) und
+    Spaltenauswahl werden in den Scan übernommen, sodass nur die benötigten Spalten gelesen werden.
+
+    Parameters:
+    filters (list): Liste von services.query.Filter.
+
+    Returns:
+    pl.LazyFrame: Die gefilterten Spieler-Scores.
+
+    Raises:
+    FileNotFoundError: Wenn der Cache noch nicht angelegt wurde.
+    """
+    if not os.path.isfile(cache_path):
+        raise FileNotFoundError(f"Player scores cache '{cache_path}' does not exist.")
+    lf = pl.scan_ipc(cache_path, memory_map=True)
+    if filters:
+        lf = lf.filter(pl.all_horizontal([compile_filter_polars(f) for f in filters]))
+    return lf
@@ -0,0 +1,142 @@
+# query.py
+
+from typing import Any, NamedTuple
+import polars as pl
+from psycopg2 import sql
+
+class Filter(NamedTuple):
+    """
+    Ein typisierter Filterausdruck auf eine einzelne Spalte, z.B. Filter("season", "==", 2024).
+
+    Unterstützte Operatoren: "==", "!=", "<", "<=", ">", ">=", "in", "not_in", "is_null", "not_null", "contains".
+    Bei "in" darf die Werteliste None enthalten; dann werden auch NULL-Werte gefunden.
+    "contains" sucht den Wert als Teilstring ohne Beachtung der Groß-/Kleinschreibung.
+    """
+    column: str
+    op: str
+    value: Any = None
+
+_COMPARISON_OPS = {"==": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+def _split_null(values) -> tuple[list, bool]:
+    values = list(values)
+    return [v for v in values if v is not None], any(v is None for v in values)
+
+def compile_filter_sql(f: Filter) -> tuple[sql.Composable, list]:
+    """
+    Übersetzt einen Filter in einen parametrisierten SQL-Ausdruck.
+
+    Returns:
+    tuple: (SQL-Fragment, Parameterliste)
+    """
+    column = sql.Identifier(f.column)
+    if f.op in _COMPARISON_OPS:
+        return sql.SQL("{} {} %s").format(column, sql.SQL(_COMPARISON_OPS[f.op])), [f.value]
+    if f.op in ("in", "not_in"):
+        values, with_null = _split_null(f.value)
+        if f.op == "in":
+            clause = sql.SQL("{} = ANY(%s)").format(column)
+            if with_null:
+                clause = sql.SQL("({} OR {} IS NULL)").format(clause, column)
+        else:
+            clause = sql.SQL("NOT ({} = ANY(%s))").format(column)
+            if with_null:
+                clause = sql.SQL("({} AND {} IS NOT NULL)").format(clause, column)
+        return clause, [values]
+    if f.op == "is_null":
+        return sql.SQL("{} IS NULL").format(column), []
+    if f.op == "not_null":
+        return sql.SQL("{} IS NOT NULL").format(column), []
+    if f.op == "contains":
+        return sql.SQL("POSITION(LOWER(%s) IN LOWER({}::text)) > 0").format(column), [str(f.value)]
+    raise ValueError(f"Unbekannter Filteroperator: '{f.op}'")
+
+def build_select(table: str, columns: list = None, filters: list = None) -> tuple[sql.Composable, list]:
+    """
+    Baut eine parametrisierte SELECT-Abfrage mit Projektion und Filtern (UND-verknüpft).
+
+    Parameters:
+    table (str): Der Name der Tabelle.
+    columns (list): Die zu ladenden Spalten. None lädt alle Spalten.
+    filters (list): Liste von Filter-Objekten.
+
+    Returns:
+    tuple: (SQL-Abfrage, Parameterliste)
+    """
+    if columns:
+        projection = sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+    else:
+        projection = sql.SQL("*")
+    query = sql.SQL("SELECT {} FROM {}").format(projection, sql.Identifier(table))
+
+    params = []
+    if filters:
+        clauses = []
+        for f in filters:
+            clause, clause_params = compile_filter_sql(f)
+            clauses.append(clause)
+            params.extend(clause_params)
+        query = sql.SQL("{} WHERE {}").format(query, sql.SQL(" AND ").join(clauses))
+    return query, params
+
+def build_page_select(table: str, columns: list = None, filters: list = None, order_by: str = None,
+                      descending: bool = False, limit: int = None, offset: int = 0) -> tuple[sql.Composable, sql.Composable, list]:
+    """
+    Baut die Abfrage für eine Seite einer Tabelle (sortiert, gefiltert, mit LIMIT/OFFSET) und die
+    zugehörige Zählabfrage über alle gefilterten Zeilen.
+
+    Returns:
+    tuple: (Seitenabfrage, Zählabfrage, Parameterliste der Filter)
+    """
+    query, params = build_select(table, columns, filters)
+    count_query = sql.SQL("SELECT COUNT(*) FROM ({}) AS q").format(query)
+    if order_by:
+        query = sql.SQL("{} ORDER BY {} {} NULLS LAST").format(
+            query, sql.Identifier(order_by), sql.SQL("DESC" if descending else "ASC")
+        )
+    if limit is not None:
+        query = sql.SQL("{} LIMIT {} OFFSET {}").format(query, sql.Literal(int(limit)), sql.Literal(int(offset)))
+    return query, count_query, params
+
+def compile_filter_polars(f: Filter) -> pl.Expr:
+    """
+    Übersetzt einen Filter in einen äquivalenten Polars-Ausdruck.
+    """
+    column = pl.col(f.column)
+    if f.op == "==":
+        return column == f.value
+    if f.op == "!=":
+        return column != f.value
+    if f.op == "<":
+        return column < f.value
+    if f.op == "<=":
+        return column <= f.value
+    if f.op == ">":
+        return column > f.value
+    if f.op == ">=":
+        return column >= f.value
+    if f.op in ("in", "not_in"):
+        values, with_null = _split_null(f.value)
+        if f.op == "in":
+            expr = column.is_in(values)
+            return (expr | column.is_null()) if with_null else expr
+        expr = ~column.is_in(values)
+        return (expr & column.is_not_null()) if with_null else expr
+    if f.op == "is_null":
+        return column.is_null()
+    if f.op == "not_null":
+        return column.is_not_null()
+    if f.op == "contains":
+        return column.cast(pl.Utf8).str.to_lowercase().str.contains(str(f.value).lower(), literal=True)
+    raise ValueError(f"Unbekannter Filteroperator: '{f.op}'")
+
+def apply_query(df: pl.DataFrame, columns: list = None, filters: list = None) -> pl.DataFrame:
+    """
+    Wendet Filter und Projektion auf einen bereits geladenen DataFrame an.
+    Liefert dasselbe Ergebnis wie build_select() auf der Datenbank.
+    """
+    if filters:
+        df = df.filter(pl.all_horizontal([compile_filter_polars(f) for f in filters]))
+    if columns:
+        df = df.select(columns)
+    return df
@@ -0,0 +1,252 @@
+# schema.py
+
+import logging
+from psycopg2 import sql
+from services.connection_pool import get_connection
+from config.config import LEAGUE_ID
+
+# Datenbankschema: typisierte Kernspalten, Primärschlüssel, zusammengesetzte Indizes für die häufigen
+# Filter und materialisierte Sichten für die Auswahllisten der GUI.
+# Weitere Spalten aus den Scraping-Ergebnissen ergänzt bulk_writer.ensure_table beim Schreiben.
+# Alle Tabellen sind nach league_id partitioniert; bestehende Zeilen ohne Liga gehören zu LEAGUE_ID.
+# Aufruf aus dem Repository-Wurzelverzeichnis:
+#   PYTHONPATH=app python -m services.schema
+
+_LEAGUE_COLUMN = f"INTEGER NOT NULL DEFAULT {LEAGUE_ID}"
+
+TABLES = {
+    "franchises": {
+        "columns": {
+            "league_id": _LEAGUE_COLUMN,
+            "franchise_id": "TEXT NOT NULL",
+            "season": "INTEGER NOT NULL",
+            "franchise_name": "TEXT",
+            "conference": "TEXT",
+            "division": "TEXT",
+            "logo": "TEXT",
+        },
+        "primary_key": ["league_id", "franchise_id", "season"],
+    },
+    "roster": {
+        "columns": {
+            "league_id": _LEAGUE_COLUMN,
+            "player_id": "INTEGER NOT NULL",
+            "season": "INTEGER NOT NULL",
+            "franchise_id": "TEXT",
+            "franchise_name": "TEXT",
+            "pos": "TEXT",
+            "salary": "DOUBLE PRECISION",
+        },
+        "primary_key": ["league_id", "player_id", "season"],
+    },
+    "contracts": {
+        "columns": {
+            "league_id": _LEAGUE_COLUMN,
+            "player_id": "INTEGER NOT NULL",
+            "season": "INTEGER NOT NULL",
+            "franchise_id": "TEXT",
+            "franchise_name": "TEXT",
+            "pos": "TEXT",
+            "salary": "DOUBLE PRECISION",
+            "conference": "TEXT",
+            "division": "TEXT",
+            "logo": "TEXT",
+        },
+        "primary_key": ["league_id", "player_id", "season"],
+    },
+}
+
+# Name -> (Tabelle, Spalten, INCLUDE-Spalten für Index-Only-Scans)
+INDEXES = {
+    "contracts_league_franchise_season_idx": ("contracts", ["league_id", "franchise_name", "season"], []),
+    "contracts_league_season_pos_idx": ("contracts", ["league_id", "season", "pos"], []),
+    "roster_league_season_pos_idx": ("roster", ["league_id", "season", "pos"], ["salary"]),
+    "franchises_league_name_season_idx": ("franchises", ["league_id", "franchise_name", "season"], []),
+    "epv_league_season_player_ext_idx": ("epv", ["league_id", "season", "player_id", "ext_yrs"], []),
+    "epv_league_season_franchise_idx": ("epv", ["league_id", "season", "franchise_name"], []),
+}
+
+# Name -> (Abfrage, Spalten des eindeutigen Index für REFRESH ... CONCURRENTLY)
+VIEWS = {
+    "mv_teams": (
+        """
+        SELECT league_id, COALESCE(franchise_name, 'Free Agent') AS franchise_name, MIN(logo) AS logo, MIN(division) AS division
+        FROM contracts
+        GROUP BY 1, 2
+        """,
+        ["league_id", "franchise_name"],
+    ),
+    "mv_seasons": (
+        "SELECT DISTINCT league_id, season FROM contracts",
+        ["league_id", "season"],
+    ),
+    "mv_salary_ranks": (
+        """
+        SELECT league_id, season, pos,
+               ROW_NUMBER() OVER (PARTITION BY league_id, season, pos ORDER BY salary DESC) AS rank, salary
+        FROM roster
+        WHERE salary IS NOT NULL
+        """,
+        ["league_id", "season", "pos", "rank"],
+    ),
+}
+
+def create_table(cursor, table: str) -> None:
+    """
+    Legt eine deklarierte Tabelle mit Primärschlüssel an, falls sie fehlt, und ergänzt fehlende Kernspalten.
+    Bestehende Tabellen behalten ihre Spaltentypen.
+    """
+    spec = TABLES[table]
+    columns = [
+        sql.SQL("{} {}").format(sql.Identifier(name), sql.SQL(definition))
+        for name, definition in spec["columns"].items()
+    ]
+    columns.append(sql.SQL("PRIMARY KEY ({})").format(sql.SQL(", ").join(map(sql.Identifier, spec["primary_key"]))))
+    cursor.execute(sql.SQL("CREATE TABLE IF NOT EXISTS {} ({})").format(sql.Identifier(table), sql.SQL(", ").join(columns)))
+    for name, definition in spec["columns"].items():
+        cursor.execute(
+            sql.SQL("ALTER TABLE {} ADD COLUMN IF NOT EXISTS {} {}").format(
+                sql.Identifier(table), sql.Identifier(name), sql.SQL(definition.replace(" NOT NULL", ""))
+            )
+        )
+    _ensure_primary_key(cursor, table, spec["primary_key"])
+
+def _ensure_primary_key(cursor, table: str, primary_key: list) -> None:
+    # Ältere Tabellen haben einen Primärschlüssel ohne league_id und werden umgestellt
+    cursor.execute(
+        """
+        SELECT con.conname, ARRAY(
+            SELECT att.attname FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = k.attnum
+            ORDER BY k.ord
+        )
+        FROM pg_constraint con
+        WHERE con.conrelid = %s::regclass AND con.contype = 'p'
+        """,
+        (table,),
+    )
+    row = cursor.fetchone()
+    if row is not None and list(row[1]) == primary_key:
+        return
+    _drop_duplicate_keys(cursor, table, primary_key)
+    columns = sql.SQL(", ").join(map(sql.Identifier, primary_key))
+    if row is None:
+        cursor.execute(sql.SQL("ALTER TABLE {} ADD PRIMARY KEY ({})").format(sql.Identifier(table), columns))
+    else:
+        cursor.execute(
+            sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}, ADD PRIMARY KEY ({})").format(
+                sql.Identifier(table), sql.Identifier(row[0]), columns
+            )
+        )
+    logging.info(f"Primärschlüssel von '{table}' auf ({', '.join(primary_key)}) umgestellt.")
+
+def _drop_duplicate_keys(cursor, table: str, primary_key: list) -> None:
+    """
+    Bereitet eine bestehende Tabelle auf den neuen Primärschlüssel vor.
+    Zeilen mit gleichem Schlüssel werden bis auf die zuletzt geschriebene (größte ctid) gelöscht.
+
+    Raises:
+    RuntimeError: Wenn eine Schlüsselspalte NULL-Werte enthält; diese Zeilen müssen von Hand bereinigt werden.
+    """
+    table_id = sql.Identifier(table)
+    key = sql.SQL(", ").join(map(sql.Identifier, primary_key))
+    cursor.execute(
+        sql.SQL("SELECT COUNT(*) FROM {} WHERE {}").format(
+            table_id, sql.SQL(" OR ").join(sql.SQL("{} IS NULL").format(sql.Identifier(column)) for column in primary_key)
+        )
+    )
+    null_rows = cursor.fetchone()[0]
+    if null_rows:
+        raise RuntimeError(
+            f"Primärschlüssel ({', '.join(primary_key)}) für '{table}' nicht anlegbar: "
+            f"{null_rows} Zeilen mit NULL in einer Schlüsselspalte."
+        )
+    cursor.execute(
+        sql.SQL(
+            """
+            DELETE FROM {table} WHERE ctid IN (
+                SELECT ctid FROM (
+                    SELECT ctid, ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY ctid DESC) AS copy
+                    FROM {table}
+                ) duplicates
+                WHERE copy > 1
+            )
+            """
+        ).format(table=table_id, key=key)
+    )
+    if cursor.rowcount:
+        logging.warning(f"{cursor.rowcount} doppelte Zeilen aus '{table}' vor dem Anlegen des Primärschlüssels gelöscht.")
+
+def ensure_indexes(cursor, table: str = None) -> None:
+    """
+    Legt die deklarierten Indizes an (optional nur die einer Tabelle).
+    """
+    for name, (index_table, columns, include) in INDEXES.items():
+        if table is not None and index_table != table:
+            continue
+        query = sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} ({})").format(
+            sql.Identifier(name), sql.Identifier(index_table), sql.SQL(", ").join(map(sql.Identifier, columns))
+        )
+        if include:
+            query = sql.SQL("{} INCLUDE ({})").format(query, sql.SQL(", ").join(map(sql.Identifier, include)))
+        cursor.execute(query)
+
+def create_views(cursor) -> None:
+    """
+    Legt die materialisierten Sichten samt eindeutigem Index an, falls sie fehlen.
+    Sichten, denen Spalten des eindeutigen Index fehlen (z.B. league_id), werden neu angelegt.
+    """
+    for name, (query, unique_columns) in VIEWS.items():
+        cursor.execute(
+            "SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped",
+            (name,),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing and not set(unique_columns) <= existing:
+            cursor.execute(sql.SQL("DROP MATERIALIZED VIEW {}").format(sql.Identifier(name)))
+            logging.info(f"Materialisierte Sicht '{name}' wird mit neuen Spalten angelegt.")
+        cursor.execute(sql.SQL("CREATE MATERIALIZED VIEW IF NOT EXISTS {} AS {}").format(sql.Identifier(name), sql.SQL(query)))
+        cursor.execute(
+            sql.SQL("CREATE UNIQUE INDEX IF NOT EXISTS {} ON {} ({})").format(
+                sql.Identifier(f"{name}_key"), sql.Identifier(name), sql.SQL(", ").join(map(sql.Identifier, unique_columns))
+            )
+        )
+
+def ensure_schema() -> None:
+    """
+    Legt Tabellen, Indizes und materialisierte Sichten an, soweit sie fehlen. Mehrfach ausführbar.
+    """
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            for table in TABLES:
+                create_table(cursor, table)
+            cursor.execute("SELECT EXISTS (SELECT FROM pg_tables WHERE schemaname = 'public' AND tablename = 'epv')")
+            epv_exists = cursor.fetchone()[0]
+            if epv_exists:
+                # Vorberechnete EPVs ohne Liga gehören zu LEAGUE_ID
+                cursor.execute(sql.SQL("ALTER TABLE epv ADD COLUMN IF NOT EXISTS league_id {}").format(
+                    sql.SQL(_LEAGUE_COLUMN.replace(" NOT NULL", ""))
+                ))
+            for table in {index_table for index_table, _, _ in INDEXES.values()}:
+                if table != "epv" or epv_exists:
+                    ensure_indexes(cursor, table)
+            create_views(cursor)
+        conn.commit()
+    logging.info("Datenbankschema geprüft (Tabellen, Indizes, materialisierte Sichten).")
+
+def refresh_views(names: list = None) -> None:
+    """
+    Aktualisiert die materialisierten Sichten (optional nur die genannten) nach einem Datenbank-Update.
+    CONCURRENTLY blockiert dabei keine gleichzeitigen Lesezugriffe der GUI.
+    """
+    names = list(VIEWS) if names is None else names
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            for name in names:
+                cursor.execute(sql.SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY {}").format(sql.Identifier(name)))
+        conn.commit()
+    logging.info(f"Materialisierte Sichten aktualisiert: {', '.join(names)}.")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    ensure_schema()
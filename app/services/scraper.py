@@ -0,0 +1,73 @@
+# scraper.py
+
+import importlib
+import polars as pl
+from config.config import SCRAPER_BACKEND
+
+# Austauschbares Scraping-Backend, ausgewählt über SCRAPER_BACKEND:
+#   "ffscrapr": R-Paket ffscrapr über rpy2 (services/ffscrapr.py)
+#   "native":   asynchroner Python-Client für die MFL-API (services/mfl_client.py)
+# Beide Module stellen dieselben fetch_*-Funktionen bereit. Die Funktionen hier sind auf Modulebene
+# definiert, damit sie an die Worker-Prozesse des Ingestion-Schedulers übergeben werden können.
+
+BACKENDS = {
+    "ffscrapr": "services.ffscrapr",
+    "native": "services.mfl_client",
+}
+
+# HTTP-Anfragen an MFL pro Abruf (für beide Backends gleich), damit der TokenBucket des Ingestion-Schedulers
+# die tatsächlichen Aufrufe zählt:
+#   rosters:      rosters, players und league (Franchise-Namen)
+#   playerscores: eine Anfrage pro Woche, dazu players, wenn die Spielerliste nicht vorab geladen wurde
+REQUESTS = {"franchises": 1, "rosters": 3, "players": 1, "playerscores": 1, "starter_positions": 1}
+
+# Backends, die die Spielerliste (players, DETAILS=1) einmal pro Lauf vorab laden (fetch_players) und an
+# fetch_playerscores übergeben. ff_playerscores lädt sie selbst.
+PRELOAD_PLAYERS = {"native"}
+
+def get_backend(name: str = SCRAPER_BACKEND):
+    """
+    Gibt das Modul des konfigurierten Scraping-Backends zurück.
+
+    Raises:
+    ValueError: Wenn das Backend unbekannt ist.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown scraper backend '{name}'. Expected one of {sorted(BACKENDS)}.")
+    return importlib.import_module(BACKENDS[name])
+
+def to_polars(df) -> pl.DataFrame:
+    """
+    Vereinheitlicht die Rückgabe der Backends (pandas bei ffscrapr, Polars beim nativen Client).
+    """
+    return df if isinstance(df, pl.DataFrame) else pl.from_pandas(df)
+
+def request_count(kind: str, weeks: int = 1, players_loaded: bool = False) -> int:
+    """
+    Gibt die Anzahl der HTTP-Anfragen eines Abrufs zurück (siehe REQUESTS), z.B. als IngestionJob.calls.
+    """
+    if kind == "playerscores":
+        return weeks * REQUESTS["playerscores"] + (0 if players_loaded else REQUESTS["players"])
+    return REQUESTS[kind]
+
+def fetch_franchises(season, league_id):
+    return get_backend().fetch_franchises(season, league_id)
+
+def fetch_rosters(season, league_id):
+    return get_backend().fetch_rosters(season, league_id)
+
+def preloads_players(name: str = SCRAPER_BACKEND) -> bool:
+    """
+    Gibt an, ob das Backend die Spielerliste einmal pro Lauf vorab lädt, statt sie bei jedem
+    Wochen-Abruf erneut abzurufen. Das Backend-Modul (und damit R) wird dafür nicht geladen.
+    """
+    return name in PRELOAD_PLAYERS
+
+def fetch_players(season, league_id):
+    return get_backend().fetch_players(season, league_id)
+
+def fetch_playerscores(season, league_id, weeks, players=None):
+    return get_backend().fetch_playerscores(season, league_id, weeks, players)
+
+def fetch_starter_positions(season, league_id):
+    return get_backend().fetch_starter_positions(season, league_id)
@@ -0,0 +1,97 @@
+# snapshot_cache.py
+
+import logging
+import threading
+import time
+from typing import Callable
+import polars as pl
+from config.config import CACHE_TTL_SECONDS
+
+# Prozessweiter Speicher: key -> (Ladezeitpunkt, Version, DataFrame).
+# invalidate() wirkt nur im eigenen Prozess; andere Prozesse (z.B. das Datenbank-Update) erreichen ihn nicht.
+_snapshots: dict = {}
+_key_locks: dict = {}
+_lock = threading.Lock()
+_version = 0
+
+def _get_key_lock(key: str) -> threading.Lock:
+    with _lock:
+        if key not in _key_locks:
+            _key_locks[key] = threading.Lock()
+        return _key_locks[key]
+
+def get_snapshot(key: str, loader: Callable[[], pl.DataFrame], ttl: float = None) -> pl.DataFrame:
+    """
+    Gibt den zwischengespeicherten Snapshot für `key` zurück. Fehlt er oder ist er älter als die TTL,
+    wird er genau einmal über `loader` neu geladen, auch wenn mehrere Sessions gleichzeitig anfragen.
+
+    Der zurückgegebene Polars DataFrame wird von allen Taipy-Sessions geteilt und darf nicht
+    in-place verändert werden.
+
+    Parameters:
+    key (str): Name des Snapshots, z.B. der Tabellenname.
+    loader (Callable): Funktion, die den DataFrame frisch aus der Datenbank lädt.
+    ttl (float): Gültigkeit in Sekunden. Standard ist CACHE_TTL_SECONDS.
+
+    Returns:
+    pl.DataFrame: Der gecachte DataFrame.
+    """
+    ttl = CACHE_TTL_SECONDS if ttl is None else ttl
+
+    entry = peek(key, ttl)
+    if entry is not None:
+        return entry
+
+    with _get_key_lock(key):
+        # Eine andere Session könnte den Snapshot inzwischen geladen haben
+        entry = peek(key, ttl)
+        if entry is not None:
+            return entry
+
+        version = _version
+        df = loader()
+        with _lock:
+            # Wurde während des Ladens invalidiert, wird der Snapshot nicht gespeichert
+            if version == _version:
+                _snapshots[key] = (time.monotonic(), version, df)
+        logging.info(f"Snapshot '{key}' geladen (Version {version}, {df.height} Zeilen).")
+        return df
+
+def peek(key: str, ttl: float = None) -> pl.DataFrame | None:
+    """
+    Gibt den Snapshot für `key` zurück, falls er vorhanden und noch gültig ist, sonst None.
+    Lädt niemals nach.
+    """
+    ttl = CACHE_TTL_SECONDS if ttl is None else ttl
+    with _lock:
+        entry = _snapshots.get(key)
+    if entry is None:
+        return None
+    loaded_at, version, df = entry
+    if version != _version or time.monotonic() - loaded_at > ttl:
+        return None
+    return df
+
+def invalidate(key: str = None) -> int:
+    """
+    Verwirft einen einzelnen Snapshot oder, ohne `key`, alle Snapshots und erhöht die Version.
+
+    Returns:
+    int: Die neue Version.
+    """
+    global _version
+    with _lock:
+        if key is None:
+            _snapshots.clear()
+            _version += 1
+            logging.info(f"Alle Snapshots verworfen (neue Version {_version}).")
+        else:
+            _snapshots.pop(key, None)
+            logging.info(f"Snapshot '{key}' verworfen.")
+        return _version
+
+def get_version() -> int:
+    """
+    Gibt die aktuelle Version der Snapshots zurück. Sie wird bei jedem vollständigen invalidate() erhöht.
+    """
+    return _version
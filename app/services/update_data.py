@@ -1,50 +1,109 @@
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from services.database_service import create_connection, load_franchises, load_rosters, calculate_and_save_contracts, load_playerscores
+from services.connection_pool import pool_stats
+from services.ingestion import franchise_jobs, roster_jobs, calculate_and_save_contracts, load_playerscores
+from services.ingestion_scheduler import run_ingestion
+from services.epv_calculations import materialize_epvs
+from services.metrics import export_metrics, span
+from services.schema import ensure_schema, refresh_views
 
 # Importiere Konfigurationsvariablen
-from config.config import START_YEAR, DEFAULT_SEASON, LEAGUE_ID
+from config.config import START_YEAR, DEFAULT_SEASON, LEAGUE_IDS, LEAGUE_WORKERS
 
-def update_database(start_year: int, end_year: int, league_id: int):
+def update_league(start_year: int, end_year: int, league_id: int) -> None:
     """
-    Zentrale Funktion, um alle Datenbanktabellen zu aktualisieren (Franchises, Roster, Verträge, etc.).
-    """
-    logging.info(f"Starting database update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    Aktualisiert alle Tabellen einer Liga (Franchises, Roster, Verträge, Scores, EPVs).
+    Läuft in einem eigenen Worker-Prozess mit eigenem Verbindungspool und eigenem Ratenlimit.
 
+    Raises:
+    Exception: Fehler eines Schritts werden an update_database weitergereicht.
+    """
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s - %(levelname)s - [league {league_id}] %(message)s")
     try:
-        # Erstelle die Datenbankverbindung
-        conn = create_connection()
+        _update_league_steps(start_year, end_year, league_id)
+    finally:
+        # Der Worker hat keinen Metrik-Endpunkt; seine Stufen werden als Datei und im Log ausgegeben
+        export_metrics(f"update-{league_id}")
+
+def _update_league_steps(start_year: int, end_year: int, league_id: int) -> None:
+    # Schritt 1 und 2: Aktualisiere die Tabellen 'franchises' und 'rosters' in einem gemeinsamen Abruf-Pool
+    logging.info("Updating franchises and rosters tables...")
+    with span("update.franchises_rosters"):
+        run_ingestion(franchise_jobs(start_year, end_year, league_id) + roster_jobs(start_year, end_year, league_id))
+
+    # Schritt 3: Spieler-Scores abrufen und den Arrow-Cache neu schreiben (falls notwendig).
+    # Die Verträge werden aus diesem Cache berechnet und müssen daher danach kommen.
+    logging.info("Updating player scores store...")
+    with span("update.playerscores"):
+        load_playerscores(league_id, list(range(start_year, end_year + 1)))
+
+    # Schritt 4: Aktualisiere die Tabelle 'contracts'
+    logging.info("Updating contracts table...")
+    with span("update.contracts"):
+        calculate_and_save_contracts(start_year, end_year, league_id)
 
-        # Schritt 1: Aktualisiere die Tabelle 'franchises'
-        logging.info("Updating franchises table...")
-        load_franchises(start_year, end_year, league_id, conn)
+    # Die EPV-Vorberechnung liest die Gehaltsränge aus mv_salary_ranks; die Sicht muss daher den eben
+    # geschriebenen Roster enthalten (bei einer neuen Datenbank ist sie sonst leer)
+    with span("update.salary_ranks"):
+        refresh_views(["mv_salary_ranks"])
 
-        # Schritt 2: Aktualisiere die Tabelle 'rosters'
-        logging.info("Updating rosters table...")
-        load_rosters(start_year, end_year, league_id, conn)
+    # Schritt 5: EPVs für alle Spieler, Saisons und Verlängerungsdauern vorberechnen
+    logging.info("Updating epv table...")
+    with span("update.epv"):
+        materialize_epvs(start_year, end_year, league_id)
 
-        # Schritt 3: Aktualisiere die Tabelle 'contracts'
-        logging.info("Updating contracts table...")
-        calculate_and_save_contracts(start_year, end_year, conn)
+def update_database(start_year: int, end_year: int, league_ids: list):
+    """
+    Zentrale Funktion, um alle Datenbanktabellen zu aktualisieren (Franchises, Roster, Verträge, etc.).
+    Die Ligen werden parallel in bis zu LEAGUE_WORKERS Prozessen aktualisiert; jede Liga schreibt nur ihre
+    eigene Partition (league_id). Schema und materialisierte Sichten werden einmal für alle Ligen gepflegt.
+
+    Das Update läuft in eigenen Prozessen und erreicht den Snapshot-Cache der GUI nicht: Laufende Sessions
+    sehen die neuen Daten erst, wenn ihre Snapshots nach CACHE_TTL_SECONDS ablaufen.
+    """
+    logging.info(f"Starting database update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    try:
+        # Tabellen mit Schlüsseln, Indizes und materialisierten Sichten anlegen, soweit sie fehlen
+        ensure_schema()
 
-        # Schritt 4: Aktualisiere die Tabelle 'playerscores' (falls notwendig)
-        logging.info("Updating playerscores table...")
-        load_playerscores(conn)
+        # "spawn", damit jede Liga ihren eigenen Verbindungspool und Ingestion-Pool erhält;
+        # ein frischer Prozess pro Liga, damit die exportierten Metriken nur diese Liga enthalten
+        errors = []
+        with ProcessPoolExecutor(
+            max_workers=max(1, min(LEAGUE_WORKERS, len(league_ids))),
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=1,
+        ) as executor:
+            futures = {executor.submit(update_league, start_year, end_year, league_id): league_id for league_id in league_ids}
+            for future in as_completed(futures):
+                league_id = futures[future]
+                try:
+                    future.result()
+                    logging.info(f"League {league_id} updated.")
+                except Exception as e:
+                    logging.error(f"Error during update of league {league_id}: {e}")
+                    errors.append(league_id)
 
-        # Änderungen speichern
-        conn.commit()
+        # Materialisierte Sichten (Teams, Saisons, Gehaltsränge) auf den neuen Stand bringen
+        with span("update.refresh_views"):
+            refresh_views()
 
+        if errors:
+            logging.error(f"Database update failed for league(s): {', '.join(map(str, errors))}")
         logging.info(f"Database update completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logging.info(f"Connection pool stats: {pool_stats()}")
     except Exception as e:
         logging.error(f"Error during database update: {e}")
     finally:
-        if conn:
-            conn.close()  # Schließe die Verbindung
+        export_metrics("update")
 
 if __name__ == "__main__":
     start_year = START_YEAR
     end_year = DEFAULT_SEASON
-    league_id = LEAGUE_ID
+    league_ids = LEAGUE_IDS
 
     # Logging konfigurieren
     logging.basicConfig(
@@ -54,4 +113,4 @@ if __name__ == "__main__":
     )
 
     # Datenbank aktualisieren
-    update_database(start_year, end_year, league_id)
\ No newline at end of file
+    update_database(start_year, end_year, league_ids)
\ No newline at end of file